@@ -0,0 +1,102 @@
+"""Throughput of FridayAssistant.process_commands against a loop of process_command calls.
+
+Upstream APIs are replaced by a local server that answers after a fixed delay, and the
+database lives in a temporary directory. Run from the K3 directory:
+    python benchmarks/batch_commands_bench.py [commands] [delay_ms]
+"""
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import APIConfig, AssistantConfig, CacheConfig, PathConfig
+
+DELAY = 0.02
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        time.sleep(DELAY)
+        body = json.dumps({
+            'name': 'Stand-in', 'main': {'temp': 20, 'humidity': 50}, 'wind': {'speed': 1},
+            'weather': [{'description': 'clear sky'}], 'articles': [{'title': 'Headline'}],
+            'choices': [{'message': {'content': 'A stand-in answer.'}}]
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # clients drop the losing attempt of a hedged request mid-reply
+
+
+def script(n):
+    """Weather, news and chat commands that all miss the caches"""
+    templates = ["what's the weather in city {i}", "tell me the latest {i} news", "tell me a fact about number {i}"]
+    return [templates[i % len(templates)].format(i=i) for i in range(n)]
+
+
+def main():
+    global DELAY
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    DELAY = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+
+    server = StandInServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    APIConfig.CURRENT_WEATHER_URL = base + "/weather"
+    APIConfig.FORECAST_URL = base + "/forecast"
+    APIConfig.NEWS_API_URL = base + "/news"
+    APIConfig.GROQ_API_URL = base + "/chat"
+    data_dir = Path(tempfile.mkdtemp())
+    PathConfig.USER_DATA_FILE = data_dir / "user_data.json"
+    PathConfig.USER_DATA_JOURNAL = data_dir / "user_data.journal"
+    PathConfig.CHAT_CACHE_FILE = data_dir / "chat_cache.json"
+    AssistantConfig.VOICE_ENABLED = False
+    AssistantConfig.CHAT_RECALL_TURNS = 0
+    CacheConfig.NEWS_PREFETCH_ENABLED = False
+
+    from modules.assistant_core import FridayAssistant
+    assistant = FridayAssistant()
+    commands = script(n)
+
+    started = time.perf_counter()
+    looped = [assistant.process_command(command) for command in commands]
+    loop_time = time.perf_counter() - started
+
+    for module in (assistant.weather, assistant.news):
+        module.cache.clear()
+    started = time.perf_counter()
+    batched = assistant.process_commands(commands)
+    batch_time = time.perf_counter() - started
+
+    assert looped == batched, "batch responses differ from the per-call loop"
+    print(f"{n} commands, {DELAY * 1000:.0f} ms upstream delay")
+    print(f"process_command loop  {loop_time:7.2f} s  {n / loop_time:8.1f} commands/s")
+    print(f"process_commands      {batch_time:7.2f} s  {n / batch_time:8.1f} commands/s")
+    print(f"speed-up              {loop_time / batch_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
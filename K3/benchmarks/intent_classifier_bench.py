@@ -0,0 +1,68 @@
+"""Accuracy and latency of the local intent classifier on the routing corpus and the held-out set.
+
+Run from the K3 directory: python benchmarks/intent_classifier_bench.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import AssistantConfig, PathConfig
+from modules.intent_classifier import IntentClassifier
+from modules.intent_router import IntentRouter, load_corpus
+
+
+def best_time(fn, repeat, rounds=5):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) / repeat
+
+
+def evaluate(name, path, router, classifier, threshold):
+    """Print router, classifier and combined accuracy on one corpus; return its lowercased commands"""
+    corpus = load_corpus(path)
+    commands = [command.lower() for _, command in corpus]
+    labels = [intent for intent, _ in corpus]
+
+    routed = [router.route(command) for command in commands]
+    predicted = classifier.predict(commands)
+    combined = list(routed)
+    resolved = 0
+    for index, (intent, probability) in enumerate(predicted):
+        if routed[index] == "chat" and intent != "chat" and probability >= threshold:
+            combined[index] = intent
+            resolved += 1
+
+    def accuracy(guesses):
+        return sum(guess == label for guess, label in zip(guesses, labels)) / len(labels)
+
+    print(f"{name} ({len(corpus)} commands, {path.name})")
+    print(f"  router              accuracy {accuracy(routed):6.1%}")
+    print(f"  classifier          accuracy {accuracy([intent for intent, _ in predicted]):6.1%}")
+    print(f"  router+classifier   accuracy {accuracy(combined):6.1%}  "
+          f"({resolved} chat fallbacks resolved locally, threshold {threshold})")
+    return commands
+
+
+def main():
+    threshold = AssistantConfig.INTENT_CLASSIFIER_THRESHOLD
+    started = time.perf_counter()
+    classifier = IntentClassifier.load()
+    print(f"model loaded in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    router = IntentRouter()
+    evaluate("routing corpus", PathConfig.INTENT_CORPUS, router, classifier, threshold)
+    commands = evaluate("held-out set", PathConfig.INTENT_HELDOUT, router, classifier, threshold)
+
+    single = best_time(lambda: classifier.predict([commands[0]]), 2000)
+    batch = best_time(lambda: classifier.predict(commands), 50) / len(commands)
+    print(f"classifier latency  {single * 1e6:7.1f} us/command single, {batch * 1e6:7.1f} us/command batched")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Routing accuracy and latency of IntentRouter against the old first-match regex loop.
+
+INTENT_RULES were written while looking at data/intent_corpus.tsv, so accuracy on it
+is optimistic. data/intent_heldout.tsv was written afterwards and never tuned against;
+its accuracy is the one to quote.
+Run from the K3 directory: python benchmarks/intent_router_bench.py
+"""
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import PathConfig
+from modules.intent_router import IntentRouter, load_corpus
+
+# The patterns FridayAssistant matched one after another before the router
+LEGACY_PATTERNS = {
+    "system": r"(open|launch|start|close|quit|exit|shutdown|restart|sleep|volume|mute|unmute|play|pause|stop)",
+    "weather": r"(weather|temperature|forecast|humidity|wind|rain|snow)",
+    "news": r"(news|headlines|articles|read|latest|update)",
+    "reminder": r"(reminder|remind me|alarm|timer)"
+}
+
+
+def legacy_route(command: str) -> str:
+    for cmd_type, pattern in LEGACY_PATTERNS.items():
+        if re.search(pattern, command):
+            return cmd_type
+    return "chat"
+
+
+def evaluate(name, route, corpus, repeat=200, rounds=5):
+    correct = sum(route(command) == intent for intent, command in corpus)
+    misses = Counter((intent, route(command)) for intent, command in corpus if route(command) != intent)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for _, command in corpus:
+                route(command)
+        timings.append(time.perf_counter() - started)
+    per_command = min(timings) / (repeat * len(corpus))  # best round, as timeit reports
+    print(f"{name:<8} accuracy {correct / len(corpus):6.1%}  {per_command * 1e6:6.1f} us/command")
+    for (expected, got), count in misses.most_common():
+        print(f"         {expected} -> {got}: {count}")
+
+
+def main():
+    router = IntentRouter()
+    for name, path in (("tuning", PathConfig.INTENT_CORPUS), ("held-out", PathConfig.INTENT_HELDOUT)):
+        corpus = [(intent, command.lower()) for intent, command in load_corpus(path)]
+        print(f"{name} set: {len(corpus)} labelled commands")
+        re.purge()  # the legacy loop relies on re's pattern cache, as it did in FridayAssistant
+        evaluate("legacy", legacy_route, corpus)
+        evaluate("router", router.route, corpus)
+
+
+if __name__ == "__main__":
+    main()
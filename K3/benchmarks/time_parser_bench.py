@@ -0,0 +1,72 @@
+"""Fast-path time parser against dateparser on a corpus of reminder time phrases.
+
+Reports first-call latency (dateparser import and locale loading included), warm
+per-phrase latency of each path, fast-path coverage and where the two disagree.
+Run from the K3 directory: python benchmarks/time_parser_bench.py
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import AssistantConfig, PathConfig
+from modules.time_parser import parse_time, parse_time_fast, parse_time_slow
+
+
+def load_phrases():
+    with open(PathConfig.REMINDER_TIME_PHRASES, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def per_call(fn, phrases, rounds=5):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for phrase in phrases:
+            fn(phrase)
+        timings.append(time.perf_counter() - started)
+    return min(timings) / len(phrases)
+
+
+def main():
+    phrases = load_phrases()
+    languages = AssistantConfig.REMINDER_LANGUAGES
+
+    started = time.perf_counter()
+    parse_time(phrases[0], languages)
+    first_fast = time.perf_counter() - started
+    started = time.perf_counter()
+    parse_time_slow(phrases[0], languages)
+    first_slow = time.perf_counter() - started
+    print(f"{len(phrases)} phrases, dateparser languages {languages}")
+    print(f"first call   fast path {first_fast * 1000:8.2f} ms   dateparser {first_slow * 1000:8.2f} ms")
+
+    now = datetime.now()
+    fast = {phrase: parse_time_fast(phrase, now) for phrase in phrases}
+    slow = {phrase: parse_time_slow(phrase, languages) for phrase in phrases}
+    covered = [phrase for phrase in phrases if fast[phrase] is not None]
+    uncovered = [phrase for phrase in phrases if fast[phrase] is None]
+
+    print(f"warm         fast path {per_call(parse_time_fast, covered) * 1e6:8.1f} us   "
+          f"dateparser {per_call(lambda p: parse_time_slow(p, languages), covered) * 1e6:8.1f} us   "
+          f"(phrases the fast path covers)")
+    print(f"warm         parse_time {per_call(lambda p: parse_time(p, languages), phrases) * 1e6:7.1f} us   "
+          f"dateparser {per_call(lambda p: parse_time_slow(p, languages), phrases) * 1e6:8.1f} us   (all phrases)")
+    print(f"coverage     {len(covered)}/{len(phrases)} phrases parsed by the fast path")
+
+    unreadable = [p for p in covered if slow[p] is None]
+    differing = [p for p in covered if slow[p] is not None and abs(fast[p] - slow[p]) > timedelta(minutes=1)]
+    agreeing = len(covered) - len(unreadable) - len(differing)
+    print(f"agreement    {agreeing}/{len(covered)} within a minute of dateparser, "
+          f"{len(unreadable)} it cannot parse at all")
+    for phrase in differing:
+        print(f"   {phrase!r:32} fast {fast[phrase]:%a %d %b %H:%M}   dateparser {slow[phrase]:%a %d %b %H:%M}")
+    print("unreadable   " + ", ".join(map(repr, unreadable)))
+    print("fallback     " + ", ".join(f"{p!r} -> {slow[p]:%d %b %H:%M}" if slow[p] else f"{p!r} -> None"
+                                      for p in uncovered))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Continuous listening pipeline on a WAV file instead of the microphone.
+
+Without a path, two one-minute files of synthetic room noise with voiced bursts at known
+times are generated: a steady room, and one where a fan comes on at 25 s. Each file is
+run with the threshold fixed and with AdaptiveThreshold following the room. Reports how
+many utterances the VAD cut against the known ones, how much of the audio reached the
+recogniser, and CPU time per second of audio.
+Run from the K3 directory: python benchmarks/vad_bench.py [file.wav [threshold]]
+"""
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import VADConfig
+from modules.mic_calibration import AdaptiveThreshold
+from modules.vad import ContinuousListener, WavFileSource
+
+SAMPLE_RATE = 16000
+NOISE_RMS = 120
+FAN_NOISE_RMS = 700  # noise level after the fan comes on, well above the default threshold
+SPEECH_RMS = 2500
+DEFAULT_THRESHOLD = 300  # speech_recognition's default energy_threshold
+UTTERANCES = [(3.0, 1.2), (8.5, 2.4), (14.0, 0.8), (19.0, 3.5), (27.0, 1.0),
+              (31.0, 2.0), (38.5, 4.0), (46.0, 0.6), (50.0, 1.8), (55.5, 2.2)]  # (start, seconds)
+
+
+def synthetic_wav(path: Path, seconds: float = 60.0, fan_at: float = None):
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, NOISE_RMS, int(seconds * SAMPLE_RATE))
+    if fan_at is not None:
+        begin = int(fan_at * SAMPLE_RATE)
+        samples[begin:] = rng.normal(0, FAN_NOISE_RMS, len(samples) - begin)
+    for start, length in UTTERANCES:
+        t = np.arange(int(length * SAMPLE_RATE)) / SAMPLE_RATE
+        # A voiced carrier with a syllable-rate envelope, including short dips inside words
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t)
+        voice = np.sin(2 * np.pi * 160 * t) + 0.5 * np.sin(2 * np.pi * 320 * t) + 0.3 * rng.normal(0, 1, len(t))
+        voice *= envelope * SPEECH_RMS / np.sqrt(np.mean(voice ** 2))
+        begin = int(start * SAMPLE_RATE)
+        samples[begin:begin + len(t)] += voice
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(np.clip(samples, -32768, 32767).astype(np.int16).tobytes())
+
+
+def run(path: Path, threshold: float, adaptive: bool, expected=None):
+    with wave.open(str(path), 'rb') as wav:
+        total_seconds = wav.getnframes() / wav.getframerate()
+    segments = []
+
+    def recognise(audio, sample_rate, sample_width):
+        segments.append(len(audio) / (sample_rate * sample_width))
+        return None
+
+    tracker = AdaptiveThreshold.from_threshold(threshold, VADConfig.FRAME_MS) if adaptive else None
+    listener = ContinuousListener(lambda: WavFileSource(path), threshold=lambda: threshold,
+                                  recognise=recognise, on_text=print,
+                                  adapt=tracker.observe if tracker else None)
+    cpu, wall = time.process_time(), time.perf_counter()
+    listener.start()
+    listener.join()
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    mode = (f"adaptive, ends at {tracker.threshold:.0f} after {tracker.recalibrations} recalibration(s)"
+            if tracker else "fixed")
+    print(f"{path.name}: {total_seconds:.1f} s of audio, threshold {threshold:.0f} {mode}")
+    print(f"  utterances   {listener.utterances}" + (f" cut, {len(expected)} spoken" if expected else ""))
+    print(f"  recogniser   {listener.speech_seconds:.1f} s of {total_seconds:.1f} s "
+          f"({listener.speech_seconds / total_seconds:.0%}); without VAD it would get all of it")
+    if expected:
+        spoken = sum(length for _, length in expected)
+        print(f"               {spoken:.1f} s was speech; segments "
+              + ", ".join(f"{seconds:.2f}" for seconds in segments))
+    print(f"  cost         {cpu * 1000 / total_seconds:.2f} ms CPU per second of audio "
+          f"({wall * 1000:.0f} ms wall for the file)")
+
+
+def main():
+    threshold = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_THRESHOLD
+    if len(sys.argv) > 1:
+        runs = [(Path(sys.argv[1]), None)]
+    else:
+        directory = Path(tempfile.mkdtemp())
+        synthetic_wav(directory / "room.wav")
+        synthetic_wav(directory / "room_with_fan.wav", fan_at=25.0)
+        runs = [(directory / "room.wav", UTTERANCES), (directory / "room_with_fan.wav", UTTERANCES)]
+    for path, expected in runs:
+        for adaptive in (False, True):
+            run(path, threshold, adaptive, expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,46 @@ class APIConfig:
     NEWS_API_URL = "https://newsapi.org/v2/top-headlines"
 
 
+class HTTPConfig:
+    HTTP2 = True  # used when the optional h2 package is installed
+    MAX_CONNECTIONS = 20
+    MAX_KEEPALIVE_CONNECTIONS = 10
+    KEEPALIVE_EXPIRY = 30.0  # seconds an idle connection is kept open
+    TIMEOUT = 15.0  # seconds, per read/write/pool wait
+    CONNECT_TIMEOUT = 5.0
+
+
+class ResilienceConfig:
+    # End-to-end latency budget per command type, in seconds; system and reminder commands run to completion
+    COMMAND_BUDGETS = {"weather": 4.0, "news": 5.0, "chat": 20.0}
+    DEFAULT_BUDGET = 20.0
+    UPSTREAM_BUDGET_SHARE = 0.8  # part of the budget an upstream call may use
+    HEDGE_PERCENTILE = 95  # send a second attempt once the first outlives this latency percentile
+    HEDGE_MIN_SAMPLES = 20  # latencies recorded before hedging kicks in
+    HEDGE_WORKERS = 16
+    BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures before an upstream is skipped
+    BREAKER_RESET_TIMEOUT = 30.0  # seconds before a trial call is let through
+
+
+class CacheConfig:
+    WEATHER_TTL = 600  # seconds a weather response is fresh
+    WEATHER_STALE_TTL = 1800  # further seconds it is served while refreshing in the background
+    WEATHER_MAX_ENTRIES = 64
+
+    NEWS_TTL = 900
+    NEWS_STALE_TTL = 1800
+    NEWS_MAX_ENTRIES = 32
+    NEWS_PAGE_SIZE = 5  # articles fetched per request; smaller counts are sliced from it, larger ones cached apart
+    NEWS_PREFETCH_ENABLED = True
+    NEWS_PREFETCH_INTERVAL = 600  # seconds between refreshes of the preferred categories
+
+    CHAT_CACHE_ENABLED = False  # opt in to caching sampled (temperature > 0) chat responses
+    CHAT_CACHE_DETERMINISTIC = True  # temperature 0 responses are cached unless this is off
+    CHAT_CACHE_MAX_ENTRIES = 500
+    CHAT_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+    CHAT_CACHE_SAVE_DELAY = 2.0  # seconds after a change before the cache file is rewritten
+
+
 class PathConfig:
     ASSETS_DIR = BASE_DIR / "assets"
     ANIMATIONS_DIR = ASSETS_DIR / "animations"
@@ -25,11 +65,27 @@ class PathConfig:
 
     DATABASE_DIR = BASE_DIR / "database"
     USER_DATA_FILE = DATABASE_DIR / "user_data.json"
+    USER_DATA_JOURNAL = DATABASE_DIR / "user_data.journal"
+    USER_DATA_SQLITE = DATABASE_DIR / "user_data.sqlite3"
+    CHAT_CACHE_FILE = DATABASE_DIR / "chat_cache.json"
+    TTS_CACHE_DIR = DATABASE_DIR / "tts_cache"
+    MIC_CALIBRATION_FILE = DATABASE_DIR / "mic_calibration.json"
     DATA_DIR = BASE_DIR / "data"
+    INTENT_CORPUS = DATA_DIR / "intent_corpus.tsv"
+    INTENT_HELDOUT = DATA_DIR / "intent_heldout.tsv"
+    INTENT_TRAINING = DATA_DIR / "intent_training.tsv"
+    INTENT_MODEL = DATA_DIR / "intent_model.npz"
+    REMINDER_TIME_PHRASES = DATA_DIR / "reminder_time_phrases.txt"
     DATABASE_DIR = BASE_DIR / "database"
     os.makedirs(DATABASE_DIR, exist_ok=True)
 
 
+class DatabaseConfig:
+    BACKEND = "json"  # "json" or "sqlite"
+    JOURNAL_ENABLED = True  # append mutations to a log instead of rewriting the snapshot
+    JOURNAL_COMPACT_BYTES = 1024 * 1024  # fold the journal into a snapshot past this size
+
+
 class UIConfig:
     WINDOW_TITLE = "Friday AI Assistant"
     WINDOW_SIZE = (800, 600)
@@ -37,6 +93,36 @@ class UIConfig:
     FONT_FAMILY = "Arial"
     FONT_SIZE = 12
     ANIMATION_DURATION = 300  # milliseconds
+    WORKER_THREADS = 8  # background tasks are I/O bound, so don't tie this to the CPU count
+
+
+class SpeechConfig:
+    PIPELINE_DEPTH = 2  # sentences synthesised ahead of the one playing
+    MIN_SENTENCE_CHARS = 20  # shorter fragments are spoken together with the next sentence
+    GTTS_LANG = "en"
+    GTTS_TLD = "com"  # Google domain, which selects the accent
+    AUDIO_CACHE_MAX_BYTES = 50 * 1024 * 1024  # synthesised sentences kept on disk
+
+
+class VADConfig:
+    FRAME_MS = 30  # audio per frame the detector classifies
+    PRE_ROLL_MS = 300  # audio kept from before the onset so the first syllable isn't clipped
+    START_MS = 90  # voiced audio needed to open an utterance; clicks and knocks are shorter
+    END_SILENCE_MS = 700  # silence that ends an utterance
+    MIN_UTTERANCE_MS = 250  # shorter utterances are dropped as noise
+    MAX_UTTERANCE_SECONDS = 10  # longer speech is cut here and sent in parts
+
+
+class CalibrationConfig:
+    NOISE_RATIO = 1.5  # energy threshold over the noise floor, as speech_recognition's dynamic_energy_ratio
+    MIN_THRESHOLD = 50
+    ADAPT_SECONDS = 10.0  # time constant for following the noise floor from quiet frames
+    DRIFT_WINDOW_SECONDS = 6.0  # audio from outside utterances the drift detector looks at
+    DRIFT_PERCENTILE = 20  # energy percentile of that window taken as the noise floor
+    STUCK_SECONDS = 15.0  # audio almost all inside utterances for this long means noise is over the threshold
+    STUCK_SHARE = 0.95  # share of those frames inside utterances that counts as almost all
+    DRIFT_RATIO = 2.0  # floor this many times above or below the estimate triggers a recalibration
+    SAVE_INTERVAL_SECONDS = 60.0  # audio between saves of an incrementally updated threshold
 
 
 class AssistantConfig:
@@ -45,7 +131,18 @@ class AssistantConfig:
     DEFAULT_NEWS_CATEGORY = "technology"
     DEFAULT_NEWS_LANGUAGE = "en"
     DEFAULT_NEWS_COUNT = 5
+    BATCH_CONCURRENCY = 16  # commands process_commands keeps in flight at once
+    INTENT_CLASSIFIER_ENABLED = True  # resolve commands the keyword router leaves to chat locally when confident
+    INTENT_CLASSIFIER_THRESHOLD = 0.7  # minimum class probability to act on
 
     VOICE_ENABLED = True
     VOICE_ENGINE = "pyttsx3"
     VOICE_TIMEOUT = 5  # seconds to wait for voice input
+    CONTINUOUS_LISTENING = False  # opt in to an always-on microphone cut into utterances by VAD
+    REMINDER_LANGUAGES = ["en"]  # dateparser languages for reminder times the fast path can't read
+
+    CHAT_RECALL_TURNS = 3  # relevant past messages pulled into chat prompts (0 disables)
+    CONTEXT_TOKEN_BUDGET = 1500  # prompt tokens for system prompt, summary, history and message
+    CONTEXT_MAX_TURNS = 20  # most recent messages considered for the prompt
+    CONTEXT_SUMMARY_REFRESH_TURNS = 10  # prompts built between summary refreshes
+    CONTEXT_SUMMARY_SOURCE_TURNS = 40  # older messages folded in per refresh
@@ -1,14 +1,45 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import MainWindow
-from config import UIConfig
+from modules.startup import profiler
+
+PROFILE_FLAG = "--profile-startup"
 
 def main():
+    profile = PROFILE_FLAG in sys.argv
+    if profile:
+        sys.argv.remove(PROFILE_FLAG)
+        profiler.enable()  # before the UI imports, so they are timed too
+
+    with profiler.timed("import ui"):
+        from PyQt5.QtCore import QEvent, QObject
+        from PyQt5.QtWidgets import QApplication
+        from ui.main_window import MainWindow
+        from config import UIConfig
+
     app = QApplication(sys.argv)
     app.setApplicationName(UIConfig.WINDOW_TITLE)
-    window = MainWindow()
+    with profiler.timed("MainWindow"):
+        window = MainWindow()
     window.show()
+    profiler.mark("window shown")
+
+    if profile:
+        class FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    app.removeEventFilter(self)
+                    profiler.mark("first paint")
+                    print(profiler.report())
+                return False
+
+        def on_warmed_up():
+            profiler.mark("warm-up finished")
+            print(profiler.report())
+
+        first_paint = FirstPaint()
+        app.installEventFilter(first_paint)
+        window.warmed_up.connect(on_warmed_up)
+
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
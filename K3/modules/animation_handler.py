@@ -11,6 +11,7 @@ class AnimationHandler(QObject):
             'idle': str(PathConfig.ANIMATIONS_DIR / 'idle.json'),
             'listening': str(PathConfig.ANIMATIONS_DIR / 'listening.json'),
             'processing': str(PathConfig.ANIMATIONS_DIR / 'processing.json'),
+            'busy': str(PathConfig.ANIMATIONS_DIR / 'processing.json'),
             'error': str(PathConfig.ANIMATIONS_DIR / 'error.json'),
             'speaking': str(PathConfig.ANIMATIONS_DIR / 'speaking.json')
         }
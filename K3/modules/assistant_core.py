@@ -1,32 +1,45 @@
-import re
+import asyncio
 import threading
 import platform
 import subprocess
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Callable, Dict, Any, Hashable, Iterable, Iterator, List
 from datetime import datetime
-from config import AssistantConfig
+from config import AssistantConfig, CacheConfig, CalibrationConfig, PathConfig, SpeechConfig, VADConfig
 from modules.json_db import db
-from modules.system_control import SystemControl
-from modules.weather import WeatherModule
-from modules.news import NewsModule
-from modules.chat import ChatModule
 from modules.animation_handler import AnimationHandler
-import speech_recognition as sr
-import pyttsx3
-from gtts import gTTS
-import tempfile
-import time
-from modules.reminder import ReminderModule
+from modules.async_runtime import run_sync
+from modules.resilience import command_budget
+from modules.intent_router import IntentRouter
+from modules.startup import lazy_init, profiler
+from modules.speech import PRIORITY_REMINDER, PRIORITY_RESPONSE, SpeechHandle
+from modules.recurrence import describe_recurrence
 
 class FridayAssistant:
+    REMINDER_LIST_LIMIT = 10  # reminders read out by "list reminders"
+    # Commands that change local state; in a batch they run one at a time, in script order
+    SEQUENTIAL_COMMANDS = ("system", "reminder")
+    # Subsystems warm_up builds ahead of first use, most useful first
+    WARM_UP_ORDER = ("reminder", "classifier", "weather", "news", "chat", "speech", "system")
+    # Responses that never change, synthesised by warm_up so they play without a network round trip
+    FIXED_RESPONSES = (
+        "Increasing volume.", "Decreasing volume.", "Volume muted.", "Volume unmuted.",
+        "Playing media.", "Media paused.", "Media stopped.", "Okay.",
+        "I couldn't determine which application to open.", "I didn't understand that system command.",
+        "Here are the latest news headlines:", "Sorry, I couldn't fetch any news at the moment.",
+        "Sorry, I couldn't fetch the weather data.", "You have no upcoming reminders.",
+    )
+
     def __init__(self):
-        self.system = SystemControl()
-        self.weather = WeatherModule()
-        self.news = NewsModule()
-        self.chat = ChatModule()
+        # Subsystems (system, weather, news, chat, reminder, classifier, voice) are built on
+        # first use or by warm_up(), so constructing the assistant imports nothing heavy
         self.animation = AnimationHandler()
-        self.reminder = ReminderModule()
+        self._calibrated = False
+        self._needs_full_calibration = False
+        self._mic_device = None
+        self.listener = None
+        self.noise_tracker = None
+        self._calibration_lock = threading.Lock()
         
         # Application mapping for different operating systems
         self.app_mapping = {
@@ -55,79 +68,161 @@ class FridayAssistant:
             "chat": self._handle_chat_command,
             "reminder": self._handle_reminder_command
         }
-
-        self.command_patterns = {
-            "system": r"(open|launch|start|close|quit|exit|shutdown|restart|sleep|volume|mute|unmute|play|pause|stop)",
-            "weather": r"(weather|temperature|forecast|humidity|wind|rain|snow)",
-            "news": r"(news|headlines|articles|read|latest|update)",
-            "reminder": r"(reminder|remind me|alarm|timer)"
+        self.async_command_handlers = {
+            "system": self._handle_system_command_async,
+            "weather": self._handle_weather_command_async,
+            "news": self._handle_news_command_async,
+            "chat": self._handle_chat_command_async,
+            "reminder": self._handle_reminder_command_async
         }
 
-        # Enhanced voice setup
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self._setup_voice_engine()
+        self.router = IntentRouter()
+
+    @lazy_init
+    def system(self):
+        from modules.system_control import SystemControl  # imports pyautogui
+        return SystemControl()
+
+    @lazy_init
+    def weather(self):
+        from modules.weather import WeatherModule
+        return WeatherModule()
+
+    @lazy_init
+    def news(self):
+        from modules.news import NewsModule
+        news = NewsModule()
+        if CacheConfig.NEWS_PREFETCH_ENABLED:
+            news.start_prefetch()
+        return news
+
+    @lazy_init
+    def chat(self):
+        from modules.chat import ChatModule
+        return ChatModule()
+
+    @lazy_init
+    def reminder(self):
+        from modules.reminder import ReminderModule
+        return ReminderModule(speak=lambda text: self.speak(text, PRIORITY_REMINDER))
 
-    def _setup_voice_engine(self):
-        """Initialize voice recognition and TTS with proper error handling"""
+    @lazy_init
+    def classifier(self):
+        if not AssistantConfig.INTENT_CLASSIFIER_ENABLED:
+            return None
         try:
-            # Calibrate microphone
-            with self.microphone as source:
-                print("Calibrating microphone...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            
-            # Initialize TTS
-            if AssistantConfig.VOICE_ENGINE == "pyttsx3":
-                self.tts_engine = pyttsx3.init()
-                voices = self.tts_engine.getProperty('voices')
-                self.tts_engine.setProperty('voice', voices[0].id)
-                self.tts_engine.setProperty('rate', 150)
-            else:
-                self.tts_engine = None
+            from modules.intent_classifier import IntentClassifier  # imports numpy
+            return IntentClassifier.load()
         except Exception as e:
-            print(f"Voice setup error: {e}")
-            AssistantConfig.VOICE_ENABLED = False
+            print(f"Intent classifier unavailable: {e}")
+            return None
 
-    def speak(self, text: str):
-        """Speak text with proper error handling"""
+    @lazy_init
+    def recognizer(self):
+        import speech_recognition as sr
+        return sr.Recognizer()
+
+    @lazy_init
+    def microphone(self):
+        import speech_recognition as sr
+        return sr.Microphone()
+
+    @lazy_init
+    def speech(self):
+        from modules.speech import SpeechService, Pyttsx3Backend, GTTSBackend
+        from modules.audio_cache import AudioCache
+        if AssistantConfig.VOICE_ENGINE == "pyttsx3":
+            backend = Pyttsx3Backend()
+        else:
+            backend = GTTSBackend(cache=AudioCache(PathConfig.TTS_CACHE_DIR, SpeechConfig.AUDIO_CACHE_MAX_BYTES))
+        return SpeechService(backend, on_state=lambda speaking: self._set_state("speaking" if speaking else "idle"))
+
+    @lazy_init
+    def mic_calibration(self):
+        from modules.mic_calibration import CalibrationStore
+        return CalibrationStore()
+
+    def _calibrate_microphone(self):
+        """Reuse this microphone's saved threshold; measure the room only without one or after drift"""
+        with self._calibration_lock:
+            if self._calibrated:
+                return
+            if self._mic_device is None:
+                from modules.mic_calibration import device_key
+                self._mic_device = device_key(self.microphone)
+            saved = self.mic_calibration.get(self._mic_device)
+            if saved and not self._needs_full_calibration:
+                self.recognizer.energy_threshold = saved['energy_threshold']
+            else:
+                with profiler.timed("FridayAssistant.calibrate_microphone"):
+                    with self.microphone as source:
+                        print("Calibrating microphone...")
+                        self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                self._save_threshold(full=True)
+                self._needs_full_calibration = False
+            self._calibrated = True
+
+    def _save_threshold(self, full: bool = False):
+        threshold = self.recognizer.energy_threshold
+        self.mic_calibration.update(self._mic_device, threshold, threshold / CalibrationConfig.NOISE_RATIO, full)
+
+    def warm_up(self):
+        """Build every subsystem and calibrate the microphone; meant for a background thread"""
+        for name in self.WARM_UP_ORDER:
+            try:
+                getattr(self, name)
+            except Exception as e:
+                print(f"Warm-up of {name} failed: {e}")
+        if AssistantConfig.VOICE_ENABLED:
+            try:
+                self._calibrate_microphone()
+            except Exception as e:
+                print(f"Voice setup error: {e}")
+                AssistantConfig.VOICE_ENABLED = False
+        if AssistantConfig.VOICE_ENABLED:
+            self.speech.prerender(self.FIXED_RESPONSES + tuple(f"Opening {app} for you." for app in self.app_mapping))
+
+    def speak(self, text: str, priority: int = PRIORITY_RESPONSE, key: Optional[Hashable] = None) -> SpeechHandle:
+        """Queue text on the speech thread and return at once; the handle can wait for or cancel it"""
         if not AssistantConfig.VOICE_ENABLED:
-            return
-            
-        self._set_state("speaking")
-        try:
-            if AssistantConfig.VOICE_ENGINE == "pyttsx3" and self.tts_engine:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-            else:  # Fallback to gTTS
-                with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                    tts = gTTS(text=text, lang='en')
-                    tts.save(f.name)
-                    if os.name == 'nt':  # Windows
-                        os.system(f"start {f.name}")
-                    else:  # Linux/Mac
-                        os.system(f"mpg123 {f.name}")
-                    time.sleep(1)  # Wait for playback
-        except Exception as e:
-            print(f"Speech error: {e}")
-        finally:
-            self._set_state("idle")
+            return SpeechHandle.skipped(text)
+        return self.speech.speak(text, priority, key)
+
+    def stop_speaking(self):
+        """Drop all queued speech; the sentence already playing finishes"""
+        if lazy_init.is_loaded(self, 'speech'):
+            self.speech.cancel_all()
 
     def listen_to_voice(self) -> Optional[str]:
         """Listen to voice input with robust error handling"""
         if not AssistantConfig.VOICE_ENABLED:
             return "Voice input is disabled"
+        try:
+            import speech_recognition as sr
+        except ImportError as e:
+            return f"Voice recognition error: {str(e)}"
             
         self._set_state("listening")
+        phrase_time_limit = 8
+        audio = None
         try:
+            self._calibrate_microphone()
             with self.microphone as source:
                 print("Listening... (speak now)")
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=8)
+                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=phrase_time_limit)
+            # listen() nudged the threshold towards the room's noise while it waited; keep that
+            self._save_threshold()
             text = self.recognizer.recognize_google(audio)
             print(f"Recognized: {text}")
             return text
         except sr.WaitTimeoutError:
             return "I didn't hear anything. Please try again."
         except sr.UnknownValueError:
+            heard = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+            if heard >= phrase_time_limit - 0.5:
+                # Noise louder than the threshold held the phrase open to the limit: recalibrate next time
+                self._calibrated = False
+                self._needs_full_calibration = True
             return "Sorry, I couldn't understand that."
         except sr.RequestError as e:
             return f"Speech service error: {str(e)}"
@@ -136,35 +231,184 @@ class FridayAssistant:
         finally:
             self._set_state("idle")
 
+    def start_listening(self, on_text: Callable[[str], None], open_source: Optional[Callable] = None):
+        """Listen continuously in the background, calling on_text from a worker thread for each
+        recognised utterance. open_source defaults to the microphone; a WavFileSource works too."""
+        from modules.vad import ContinuousListener
+        if self.listening:
+            return self.listener
+        self.noise_tracker = None  # set by _open_microphone_source; other sources keep a fixed threshold
+        self.listener = ContinuousListener(open_source or self._open_microphone_source,
+                                           threshold=lambda: self.recognizer.energy_threshold,
+                                           recognise=self._recognise_audio, on_text=on_text,
+                                           is_muted=lambda: lazy_init.is_loaded(self, 'speech') and self.speech.busy,
+                                           adapt=self._adapt_threshold)
+        self.listener.start()
+        return self.listener
+
+    def stop_listening(self, timeout: float = 2.0):
+        """Stop continuous listening and wait up to timeout seconds for its threads to finish"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener.join(timeout)
+
+    @property
+    def listening(self) -> bool:
+        return self.listener is not None and self.listener.running
+
+    def _open_microphone_source(self):
+        from modules.vad import MicrophoneSource
+        from modules.mic_calibration import AdaptiveThreshold
+        self._calibrate_microphone()
+        self.noise_tracker = AdaptiveThreshold.from_threshold(self.recognizer.energy_threshold, VADConfig.FRAME_MS,
+                                                              on_update=self._on_threshold_update)
+        return MicrophoneSource(self.microphone)
+
+    def _adapt_threshold(self, rms: float, in_speech: bool) -> float:
+        if self.noise_tracker is None:
+            return self.recognizer.energy_threshold
+        return self.noise_tracker.observe(rms, in_speech)
+
+    def _on_threshold_update(self, threshold: float, noise_rms: float, full: bool):
+        """Continuous listening refined the threshold; share it with one-shot listens and persist it"""
+        self.recognizer.energy_threshold = threshold
+        self.mic_calibration.update(self._mic_device, threshold, noise_rms, full)
+
+    def _recognise_audio(self, audio: bytes, sample_rate: int, sample_width: int) -> Optional[str]:
+        """Text for one utterance cut by the VAD, or None if nothing intelligible was said"""
+        import speech_recognition as sr
+        try:
+            text = self.recognizer.recognize_google(sr.AudioData(audio, sample_rate, sample_width))
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            print(f"Speech service error: {e}")
+            return None
+        print(f"Recognized: {text}")
+        return text
+
     def process_command(self, command: str) -> str:
-        """Process user command and return response"""
+        """Process user command and return response (blocking wrapper around process_command_async)"""
+        response = run_sync(self.process_command_async(command, speak=False))
+        if AssistantConfig.VOICE_ENABLED:
+            self.speak(response)
+        return response
+
+    async def process_command_async(self, command: str, speak: Optional[bool] = None) -> str:
+        """Process a command without blocking the event loop; many can be in flight at once"""
         self._set_state("processing")
-        command_lower = command.lower()
-        command_type = self._identify_command_type(command_lower)
-        
-        # Handle the command
-        if command_type in self.command_handlers:
+        command_type = self._identify_command_type(command.lower())
+        response = await self._run_handler(command_type, command)
+
+        # Add to chat history
+        db.add_chat_messages([("user", command), ("assistant", response)])
+
+        if speak is None:
+            speak = AssistantConfig.VOICE_ENABLED
+        if speak:
+            self.speak(response)
+
+        self._command_done()
+        return response
+
+    def process_commands(self, commands: Iterable[str]) -> List[str]:
+        """Process a script of commands without speaking; responses come back in input order"""
+        return run_sync(self.process_commands_async(commands))
+
+    async def process_commands_async(self, commands: Iterable[str]) -> List[str]:
+        """Route every command up front, run independent ones concurrently and save history once"""
+        commands = list(commands)
+        command_types = self._identify_command_types([command.lower() for command in commands])
+        responses = [None] * len(commands)
+        limit = asyncio.Semaphore(AssistantConfig.BATCH_CONCURRENCY)
+
+        async def run(index):
+            async with limit:
+                try:
+                    responses[index] = await self._run_handler(command_types[index], commands[index])
+                except Exception as e:
+                    # One failing command must not lose the rest of the batch
+                    responses[index] = f"Error processing command: {str(e)}"
+
+        async def run_sequential():
+            for index, command_type in enumerate(command_types):
+                if command_type in self.SEQUENTIAL_COMMANDS:
+                    await run(index)
+
+        self._set_state("processing")
+        try:
+            await asyncio.gather(run_sequential(), *(run(index) for index, command_type in enumerate(command_types)
+                                                     if command_type not in self.SEQUENTIAL_COMMANDS))
+        finally:
+            self._set_state("idle")
+
+        db.add_chat_messages([(sender, text) for command, response in zip(commands, responses)
+                              for sender, text in (("user", command), ("assistant", response))])
+        return responses
+
+    async def _run_handler(self, command_type: str, command: str) -> str:
+        """Run the handler for command_type within that command's latency budget"""
+        handler = self.async_command_handlers.get(command_type, self._handle_chat_command_async)
+        if command_type in self.SEQUENTIAL_COMMANDS:
+            # These run in an executor that a timeout can't stop, so they finish before we answer
+            return await handler(command)
+        try:
+            return await asyncio.wait_for(handler(command), command_budget(command_type))
+        except asyncio.TimeoutError:
+            return "Sorry, that took longer than expected. Please try again."
+
+    def stream_command(self, command: str) -> Iterator[str]:
+        """Like process_command, but yields chat responses piece by piece as they stream in"""
+        self._set_state("processing")
+        command_type = self._identify_command_type(command.lower())
+
+        if command_type != "chat" and command_type in self.command_handlers:
             response = self.command_handlers[command_type](command)
+            yield response
         else:
-            response = self._handle_chat_command(command)
-        
+            pieces = []
+            try:
+                for piece in self.chat.stream_response(command):
+                    pieces.append(piece)
+                    yield piece
+            except Exception as e:
+                error = f"Error processing chat: {str(e)}"
+                pieces.append(("\n" if pieces else "") + error)
+                yield pieces[-1]
+            response = "".join(pieces)
+
+        self._finish_command(command, response)
+
+    def _finish_command(self, command: str, response: str):
+        """Persist the exchange and speak the response"""
         # Add to chat history
-        db.add_chat_message("user", command)
-        db.add_chat_message("assistant", response)
-        
+        db.add_chat_messages([("user", command), ("assistant", response)])
+
         # Speak the response
         if AssistantConfig.VOICE_ENABLED:
             self.speak(response)
-        
-        self._set_state("idle")
-        return response
+
+        self._command_done()
+
+    def _command_done(self):
+        """Back to idle, unless the response is queued for speech; the speech service goes idle when it drains"""
+        if not (lazy_init.is_loaded(self, 'speech') and self.speech.busy):
+            self._set_state("idle")
 
     def _identify_command_type(self, command: str) -> str:
-        """Detect command type based on regex patterns"""
-        for cmd_type, pattern in self.command_patterns.items():
-            if re.search(pattern, command):
-                return cmd_type
-        return "chat"
+        """Detect command type by scoring every intent in one pass"""
+        return self._identify_command_types([command])[0]
+
+    def _identify_command_types(self, commands: List[str]) -> List[str]:
+        """Keyword router first; what it leaves to chat goes through the local classifier in one batch"""
+        command_types = [self.router.route(command) for command in commands]
+        unresolved = [index for index, command_type in enumerate(command_types) if command_type == "chat"]
+        if unresolved and self.classifier is not None:
+            predictions = self.classifier.predict([commands[index] for index in unresolved])
+            for index, (intent, probability) in zip(unresolved, predictions):
+                if probability >= AssistantConfig.INTENT_CLASSIFIER_THRESHOLD:
+                    command_types[index] = intent
+        return command_types
 
     def _handle_system_command(self, command: str) -> str:
         """Handle system-related commands with improved app opening"""
@@ -193,11 +437,11 @@ class FridayAssistant:
                     return f"Failed to open {app}: {str(e)}"
             return "I couldn't determine which application to open."
 
-        elif "volume" in command_lower:
-            if "up" in command_lower or "increase" in command_lower:
+        elif any(word in command_lower for word in ["volume", "sound", "louder", "quieter"]):
+            if any(word in command_lower for word in ["up", "increase", "louder", "bump", "raise"]):
                 self.system.increase_volume()
                 return "Increasing volume."
-            elif "down" in command_lower or "decrease" in command_lower:
+            elif any(word in command_lower for word in ["down", "decrease", "quieter", "lower"]):
                 self.system.decrease_volume()
                 return "Decreasing volume."
             elif "mute" in command_lower:
@@ -216,6 +460,9 @@ class FridayAssistant:
             elif "pause" in command_lower:
                 self.system.pause_media()
                 return "Media paused."
+            elif self._wants_silence(command_lower):
+                self.stop_speaking()
+                return "Okay."
             else:
                 self.system.stop_media()
                 return "Media stopped."
@@ -233,6 +480,14 @@ class FridayAssistant:
 
         return "I didn't understand that system command."
 
+    def _wants_silence(self, command: str) -> bool:
+        """Whether a stop command is meant for the assistant's voice rather than the media player"""
+        if any(word in command for word in ["music", "song", "media", "video"]):
+            return False
+        if any(word in command for word in ["talking", "speaking"]):
+            return True
+        return lazy_init.is_loaded(self, 'speech') and self.speech.busy
+
     def _extract_app_name(self, command: str) -> Optional[str]:
         """Extract application name from command using app mapping"""
         for app_name in self.app_mapping.keys():
@@ -240,21 +495,37 @@ class FridayAssistant:
                 return app_name
         return None
 
-    def _handle_weather_command(self, command: str) -> str:
-        """Handle weather-related requests"""
+    async def _handle_system_command_async(self, command: str) -> str:
+        # pyautogui and subprocess calls block, so they run in the default executor
+        return await asyncio.get_running_loop().run_in_executor(None, self._handle_system_command, command)
+
+    def _parse_weather_command(self, command: str) -> tuple:
+        """Return (location or None, wants_forecast)"""
         location = None
         if "in" in command:
             parts = command.split("in")
             if len(parts) > 1:
                 location = parts[-1].strip()
+        return location, "forecast" in command.lower()
 
-        if "forecast" in command.lower():
+    def _handle_weather_command(self, command: str) -> str:
+        """Handle weather-related requests"""
+        location, wants_forecast = self._parse_weather_command(command)
+        if wants_forecast:
             forecast = self.weather.get_weather_forecast(location)
             return self._format_forecast_response(forecast)
         else:
             weather = self.weather.get_current_weather(location)
             return self._format_weather_response(weather)
 
+    async def _handle_weather_command_async(self, command: str) -> str:
+        location, wants_forecast = self._parse_weather_command(command)
+        if wants_forecast:
+            forecast = await self.weather.get_weather_forecast_async(location)
+            return self._format_forecast_response(forecast)
+        weather = await self.weather.get_current_weather_async(location)
+        return self._format_weather_response(weather)
+
     def _format_weather_response(self, weather_data: Dict[str, Any]) -> str:
         """Present current weather data"""
         if not weather_data:
@@ -282,8 +553,8 @@ class FridayAssistant:
             response += f"{time_str}: {desc}, {temp}°C\n"
         return response
 
-    def _handle_news_command(self, command: str) -> str:
-        """Fetch news based on category or recency"""
+    def _parse_news_command(self, command: str) -> tuple:
+        """Return (category or None, count)"""
         category = None
         for cat in ["technology", "science", "business", "sports", "entertainment"]:
             if cat in command.lower():
@@ -293,10 +564,19 @@ class FridayAssistant:
         count = 3  # default
         if "latest" in command.lower() or "recent" in command.lower():
             count = 1
+        return category, count
 
+    def _handle_news_command(self, command: str) -> str:
+        """Fetch news based on category or recency"""
+        category, count = self._parse_news_command(command)
         news_items = self.news.get_news(category=category, count=count)
         return self._format_news_response(news_items)
 
+    async def _handle_news_command_async(self, command: str) -> str:
+        category, count = self._parse_news_command(command)
+        news_items = await self.news.get_news_async(category=category, count=count)
+        return self._format_news_response(news_items)
+
     def _format_news_response(self, news_items: list) -> str:
         """Format news headlines"""
         if not news_items:
@@ -313,6 +593,16 @@ class FridayAssistant:
         except Exception as e:
             return f"Error processing chat: {str(e)}"
 
+    async def _handle_chat_command_async(self, command: str) -> str:
+        try:
+            return await self.chat.get_response_async(command)
+        except Exception as e:
+            return f"Error processing chat: {str(e)}"
+
+    async def _handle_reminder_command_async(self, command: str) -> str:
+        # dateparser fallbacks and the reminder file writes block, so they run in the default executor
+        return await asyncio.get_running_loop().run_in_executor(None, self._handle_reminder_command, command)
+
     def _set_state(self, state: str):
         """Update assistant state and trigger animations"""
         self.current_state = state
@@ -324,15 +614,25 @@ class FridayAssistant:
 
         # List reminders
         if any(word in command_lower for word in ["list reminders", "show reminders", "what are my reminders"]):
-            reminders = self.reminder.get_reminders()
+            reminders = self.reminder.upcoming(self.REMINDER_LIST_LIMIT)
             if not reminders:
                 return "You have no upcoming reminders."
             response = "⏰ Your upcoming reminders:\n"
             for i, rem in enumerate(reminders, 1):
                 time_str = datetime.fromisoformat(rem['trigger_time']).strftime("%I:%M %p on %b %d")
-                response += f"{i}. {rem['name']} - {time_str}\n   {rem['message']}\n"
+                repeats = f" (repeats {describe_recurrence(rem['recurrence'])})" if rem.get('recurrence') else ""
+                response += f"{i}. {rem['name']} - {time_str}{repeats}\n   {rem['message']}\n"
+            remaining = self.reminder.count_upcoming() - len(reminders)
+            if remaining > 0:
+                response += f"...and {remaining} more.\n"
             return response
 
+        # Cancel every reminder
+        if any(word in command_lower for word in ["cancel", "delete", "remove", "clear"]) and \
+                any(phrase in command_lower for phrase in ["all reminders", "all my reminders", "all the reminders"]):
+            count = self.reminder.remove_all_reminders()
+            return f"✅ Deleted all {count} reminders." if count else "You have no reminders to delete."
+
         # Cancel reminder
         if any(word in command_lower for word in ["cancel", "delete", "remove"]):
             name = None
@@ -357,6 +657,14 @@ class FridayAssistant:
                 return f"❌ No reminder found with name '{name}'."
             return "Please specify which reminder to cancel (e.g., 'cancel reminder call mom')."
 
+        # Recurring reminder, e.g. "remind me to stand up every hour"
+        recurring = self.reminder.extract_recurring_reminder_info(command)
+        if recurring:
+            name, message, rule = recurring
+            if self.reminder.add_reminder(name, message, datetime.fromisoformat(rule['start']), recurrence=rule):
+                return f"✅ Recurring reminder set!\n'{message}' {describe_recurrence(rule)}"
+            return f"A reminder with name '{name}' already exists."
+
         # Create new reminder
         name, message, time_str = self.reminder.extract_reminder_info(command)
         if not all([name, message, time_str]):
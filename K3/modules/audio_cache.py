@@ -0,0 +1,118 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class AudioCache:
+    """Synthesised speech on disk, one file per (text, language, voice), evicted least recently used first.
+
+    Files are named by the hash of their key, so the directory is the whole index:
+    it is rebuilt at startup from file sizes and modification times, and a hit
+    touches its file to keep that order across restarts.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, suffix: str = ".mp3"):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._files: "OrderedDict[str, int]" = OrderedDict()  # key: size, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def normalise(text: str) -> str:
+        return re.sub(r"\s+", " ", text.strip())
+
+    def key(self, text: str, lang: str, voice: str) -> str:
+        raw = f"{lang}|{voice}|{self.normalise(text)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def _load(self):
+        try:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.suffix) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-len(self.suffix)], stat.st_size))
+        except FileNotFoundError:
+            return
+        for _, key, size in sorted(entries):
+            self._files[key] = size
+            self._bytes += size
+
+    def get(self, text: str, lang: str, voice: str) -> Optional[Path]:
+        key = self.key(text, lang, voice)
+        path = self.path(key)
+        with self._lock:
+            if key not in self._files:
+                self.misses += 1
+                return None
+            self._files.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)  # remember the use across restarts
+        except FileNotFoundError:
+            with self._lock:  # removed behind our back
+                self._bytes -= self._files.pop(key, 0)
+                self.hits -= 1
+                self.misses += 1
+            return None
+        return path
+
+    def put(self, text: str, lang: str, voice: str, audio: bytes) -> Path:
+        key = self.key(text, lang, voice)
+        path = self.path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so a reader never sees a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._bytes += len(audio) - self._files.pop(key, 0)
+            self._files[key] = len(audio)
+            evicted = []
+            while self._bytes > self.max_bytes and len(self._files) > 1:
+                old_key, size = self._files.popitem(last=False)
+                self._bytes -= size
+                evicted.append((old_key, size))
+        for old_key, size in evicted:
+            try:
+                os.remove(self.path(old_key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Still on disk (e.g. open in a player on Windows): keep counting it, first in line next time
+                print(f"Could not evict cached speech {old_key}: {e}")
+                with self._lock:
+                    if old_key not in self._files:
+                        self._files[old_key] = size
+                        self._files.move_to_end(old_key, last=False)
+                        self._bytes += size
+        return path
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._files
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'files': len(self._files), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
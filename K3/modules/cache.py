@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries go stale after `ttl` seconds.
+
+    Stale entries are still served for up to `stale_ttl` more seconds while a
+    background refresh replaces them; after that a lookup fetches inline.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 128, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key: (value, stored_at)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Cached value for key, calling fetch() on a miss; falsy results are not cached"""
+        value = self._lookup(key, fetch)
+        if value is not _MISSING:
+            return value
+        value = fetch()
+        if value:
+            self.put(key, value)
+        return value
+
+    async def get_or_fetch_async(self, key: Hashable, fetch_async: Callable[[], Awaitable[Any]],
+                                 refresh: Callable[[], Any]) -> Any:
+        """Like get_or_fetch, awaiting fetch_async() on a miss; stale entries are refreshed with refresh()"""
+        value = self._lookup(key, refresh)
+        if value is not _MISSING:
+            return value
+        value = await fetch_async()
+        if value:
+            self.put(key, value)
+        return value
+
+    def _lookup(self, key: Hashable, refresh: Callable[[], Any]) -> Any:
+        """Servable value for key or _MISSING, starting a background refresh when it is stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = time.monotonic() - stored_at
+                if age < self.ttl:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    self._entries.move_to_end(key)
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, refresh), daemon=True).start()
+                    return value
+            self.misses += 1
+            return _MISSING
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Any]):
+        try:
+            value = fetch()
+            if value:
+                self.put(key, value)
+        except Exception as e:
+            print(f"Background refresh of {key!r} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Fresh value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Last stored value for key however old it is, for when the upstream is unavailable"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of the cached keys, stale ones included"""
+        with self._lock:
+            return list(self._entries)
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -1,46 +1,196 @@
-import httpx
-from typing import Dict, Any
-from config import APIConfig
+import json
+import re
+import time
+from typing import Dict, Any, Iterator, Optional
+from config import APIConfig, AssistantConfig, CacheConfig, PathConfig
 from modules.json_db import db
+from modules.http_client import get_client, get_async_client
+from modules.response_cache import ResponseCache
+from modules.context_builder import ContextBuilder
+from modules.singleflight import SingleFlight
+from modules.resilience import CircuitOpenError, Upstream, upstream_timeout
+
+SYSTEM_PROMPT = "You are Friday, a helpful AI assistant. and give answer in maximum 5 lines only."
+# Prompts that lean on earlier turns; their answers depend on context, so they skip the cache
+_FOLLOW_UP_RE = re.compile(r"\b(it|its|that|this|those|these|they|them|he|she|him|her|more|again|else|also|"
+                           r"previous|above|what about|how about)\b|^(and|but|so|why)\b")
+DEGRADED_RESPONSE = "I can't reach my language service right now. Please try again in a moment."
 
 class ChatModule:
     def __init__(self):
         self.api_key = APIConfig.GROQ_API_KEY
-        self.api_url = "https://api.groq.com/openai/v1/chat/completions"
+        self.api_url = APIConfig.GROQ_API_URL
         self.model = "llama3-70b-8192"  # Current Groq model
+        self.temperature = 0.7
+        self.cache = ResponseCache(PathConfig.CHAT_CACHE_FILE, CacheConfig.CHAT_CACHE_MAX_ENTRIES,
+                                   CacheConfig.CHAT_CACHE_MAX_AGE, CacheConfig.CHAT_CACHE_SAVE_DELAY)
+        self.context = ContextBuilder(self._summarise)
+        self.flight = SingleFlight()  # identical prompts asked at the same moment share one completion
+        # Completions are slow and billed per token, so a second attempt is never raced against the first
+        self.upstream = Upstream("groq", hedge=False)
+
+    def _cache_enabled(self, message: str) -> bool:
+        # Keyed on the prompt alone, so follow-ups that depend on earlier turns are never cached
+        if _FOLLOW_UP_RE.search(message.lower()):
+            return False
+        if self.temperature == 0:
+            return CacheConfig.CHAT_CACHE_DETERMINISTIC
+        return CacheConfig.CHAT_CACHE_ENABLED
+
+    def _cached_response(self, message: str) -> Optional[str]:
+        if not self._cache_enabled(message):
+            return None
+        return self.cache.get(message, self.model, self.temperature)
+
+    def _store_response(self, message: str, text: str, started: float):
+        if text and self._cache_enabled(message):
+            self.cache.put(message, self.model, self.temperature, text, time.perf_counter() - started)
 
     def get_response(self, message: str) -> str:
         """Get formatted response text"""
+        cached = self._cached_response(message)
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
         try:
             response = self._get_api_response(message)
-            return response['choices'][0]['message']['content']
+            text = response['choices'][0]['message']['content']
+        except CircuitOpenError:
+            return DEGRADED_RESPONSE
+        except Exception as e:
+            return f"Error processing response: {str(e)}"
+        self._store_response(message, text, started)
+        return text
+
+    async def get_response_async(self, message: str) -> str:
+        """Async variant of get_response for the asyncio command engine"""
+        cached = self._cached_response(message)
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+        try:
+            response = await self._get_api_response_async(message)
+            text = response['choices'][0]['message']['content']
+        except CircuitOpenError:
+            return DEGRADED_RESPONSE
         except Exception as e:
             return f"Error processing response: {str(e)}"
+        self._store_response(message, text, started)
+        return text
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return dict(self.cache.stats(), **self.flight.stats(), upstream=self.upstream.stats())
+
+    def invalidate_cached_response(self, message: str) -> int:
+        return self.cache.invalidate(message)
 
     def get_response_raw(self, message: str) -> Dict[str, Any]:
         """Get raw API response (added to match expected interface)"""
         return self._get_api_response(message)
 
-    def _get_api_response(self, message: str) -> Dict[str, Any]:
-        """Internal method to handle API requests"""
-        messages = [
-            {"role": "system", "content": "You are Friday, a helpful AI assistant. and give answer in maximum 5 lines only."},
-            {"role": "user", "content": message}
-        ]
-        
-        json_data = {
+    def _build_request(self, message: str) -> Dict[str, Any]:
+        recalled = []
+        if AssistantConfig.CHAT_RECALL_TURNS > 0:
+            recalled = db.search_history(message, k=AssistantConfig.CHAT_RECALL_TURNS)
+        messages = self.context.build(SYSTEM_PROMPT, message, recalled)
+        return {
             "model": self.model,
             "messages": messages,
-            "temperature": 0.7,
+            "temperature": self.temperature,
             "max_tokens": 1024
         }
 
-        headers = {
+    def _summarise(self, previous: str, turns: list) -> str:
+        """Fold older turns into the running conversation summary"""
+        transcript = "\n".join(f"{t['sender']}: {t['message'][:500]}" for t in turns)
+        prompt = (f"Current summary:\n{previous or '(none)'}\n\nNew conversation turns:\n{transcript}\n\n"
+                  "Rewrite the summary to include the new turns. Keep facts, names and the user's "
+                  "preferences. At most 120 words.")
+        json_data = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0,
+            "max_tokens": 200
+        }
+        def attempt(timeout):
+            response = get_client().post(self.api_url, headers=self._headers(), json=json_data, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        response = self.upstream.call(attempt, upstream_timeout("chat"))
+        return response['choices'][0]['message']['content'].strip()
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
 
-        with httpx.Client() as client:
-            response = client.post(self.api_url, headers=headers, json=json_data)
+    @staticmethod
+    def _flight_key(request: Dict[str, Any]) -> str:
+        # The whole body: prompts with different context or settings must not share an answer
+        return json.dumps(request, sort_keys=True)
+
+    def _get_api_response(self, message: str) -> Dict[str, Any]:
+        """Internal method to handle API requests"""
+        request = self._build_request(message)
+
+        def attempt(timeout):
+            response = get_client().post(self.api_url, headers=self._headers(), json=request, timeout=timeout)
             response.raise_for_status()
-            return response.json()
\ No newline at end of file
+            return response.json()
+        return self.flight.do(self._flight_key(request),
+                              lambda: self.upstream.call(attempt, upstream_timeout("chat")))
+
+    async def _get_api_response_async(self, message: str) -> Dict[str, Any]:
+        request = self._build_request(message)
+
+        async def attempt(timeout):
+            response = await get_async_client().post(self.api_url, headers=self._headers(), json=request,
+                                                     timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        return await self.flight.do_async(self._flight_key(request),
+                                          lambda: self.upstream.call_async(attempt, upstream_timeout("chat")))
+
+    def stream_response(self, message: str) -> Iterator[str]:
+        """Yield response text as it arrives over the OpenAI-compatible SSE stream"""
+        cached = self._cached_response(message)
+        if cached is not None:
+            yield cached
+            return
+        # Build the request first: once check() admits a trial call, only the block below releases it
+        json_data = self._build_request(message)
+        json_data["stream"] = True
+        try:
+            self.upstream.check()
+        except CircuitOpenError:
+            yield DEGRADED_RESPONSE
+            return
+        started = time.perf_counter()
+        pieces = []
+        # The timeout bounds the wait for each chunk rather than the whole stream
+        timeout = upstream_timeout("chat")
+        try:
+            with get_client().stream("POST", self.api_url, headers=self._headers(), json=json_data,
+                                     timeout=timeout) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line.startswith("data:"):
+                        continue  # blank separators and SSE comments
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        break
+                    choices = json.loads(payload).get("choices") or [{}]
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        pieces.append(content)
+                        yield content
+        except GeneratorExit:
+            # The reader stopped early; that says nothing about the service
+            self.upstream.breaker.release()
+            raise
+        except Exception as e:
+            self.upstream.record_error(e)
+            raise
+        self.upstream.breaker.record_success()
+        self._store_response(message, "".join(pieces), started)
@@ -0,0 +1,116 @@
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List
+from config import AssistantConfig
+from modules.json_db import db
+
+# Roughly one BPE token per short word piece or punctuation mark
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+MESSAGE_OVERHEAD = 4  # role and separator tokens per chat message
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+class ContextBuilder:
+    """Packs recent chat turns into a token budget, rolling older turns into a running summary.
+
+    The summary is stored with the chat history, along with the timestamp of the newest
+    message in it, so each refresh folds in only the messages after that one and a
+    restart carries on from where the last refresh stopped.
+    """
+    TOKEN_CACHE_SIZE = 4096
+
+    def __init__(self, summarise: Callable[[str, List[Dict]], str]):
+        self.summarise = summarise  # (previous summary, turns) -> new summary
+        self._token_counts: Dict[tuple, int] = {}
+        self._builds_since_summary = 0
+        self._summarising = False
+        self._lock = threading.Lock()
+
+    def _message_tokens(self, message: Dict) -> int:
+        key = (message['timestamp'], message['sender'])
+        tokens = self._token_counts.get(key)
+        if tokens is None:
+            if len(self._token_counts) >= self.TOKEN_CACHE_SIZE:
+                self._token_counts.clear()
+            tokens = count_tokens(message['message']) + MESSAGE_OVERHEAD
+            self._token_counts[key] = tokens
+        return tokens
+
+    def build(self, system_prompt: str, message: str, recalled: List[Dict] = ()) -> List[Dict]:
+        """Chat messages for the API: system prompt, summary, recent turns and the new message"""
+        budget = AssistantConfig.CONTEXT_TOKEN_BUDGET
+        budget -= count_tokens(system_prompt) + count_tokens(message) + 2 * MESSAGE_OVERHEAD
+        summary = db.get_conversation_summary().get('summary', "")
+        if summary:
+            budget -= count_tokens(summary)
+
+        recent = [m for m in db.get_chat_history(limit=AssistantConfig.CONTEXT_MAX_TURNS)
+                  if m['sender'] in ('user', 'assistant')]
+        packed = []
+        for turn in reversed(recent):
+            cost = self._message_tokens(turn)
+            if cost > budget:
+                break
+            budget -= cost
+            packed.append(turn)
+        packed.reverse()
+
+        # Recalled matches that are not already in the window, while they fit
+        packed_keys = {(m['timestamp'], m['sender']) for m in packed}
+        recall_lines = []
+        for m in recalled:
+            if (m['timestamp'], m['sender']) in packed_keys:
+                continue
+            line = f"- {m['sender']}: {m['message'][:300]}"
+            cost = count_tokens(line)
+            if cost > budget:
+                break
+            budget -= cost
+            recall_lines.append(line)
+
+        content = system_prompt
+        if summary:
+            content += "\nSummary of the earlier conversation:\n" + summary
+        if recall_lines:
+            content += "\nRelevant earlier conversation:\n" + "\n".join(recall_lines)
+        messages = [{"role": "system", "content": content}]
+        messages += [{"role": turn['sender'], "content": turn['message']} for turn in packed]
+        messages.append({"role": "user", "content": message})
+
+        if packed and len(packed) < db.count_chat_messages():
+            self._maybe_refresh_summary(packed[0]['timestamp'])
+        return messages
+
+    def _maybe_refresh_summary(self, oldest_packed: str):
+        with self._lock:
+            self._builds_since_summary += 1
+            if self._summarising or self._builds_since_summary < AssistantConfig.CONTEXT_SUMMARY_REFRESH_TURNS:
+                return
+            self._summarising = True
+            self._builds_since_summary = 0
+        threading.Thread(target=self._refresh_summary, args=(oldest_packed,), daemon=True).start()
+
+    def _refresh_summary(self, oldest_packed: str):
+        """Fold the oldest turns that fell out of the window and are not yet summarised into the summary"""
+        try:
+            state = db.get_conversation_summary()
+            upto = state.get('upto')
+            # Oldest unsummarised turns first, from the start of history on the first refresh,
+            # so repeated refreshes catch up without skipping any turn
+            turns = db.get_chat_history_between(upto or datetime.min, oldest_packed)
+            turns = [t for t in turns if not upto or t['timestamp'] > upto]
+            turns = turns[:AssistantConfig.CONTEXT_SUMMARY_SOURCE_TURNS]
+            if not turns:
+                return
+            dialogue = [t for t in turns if t['sender'] in ('user', 'assistant')]
+            summary = self.summarise(state.get('summary', ""), dialogue) if dialogue else state.get('summary')
+            if summary:
+                db.set_conversation_summary(summary, turns[-1]['timestamp'])
+        except Exception as e:
+            print(f"Error refreshing conversation summary: {e}")
+        finally:
+            self._summarising = False
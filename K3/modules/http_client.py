@@ -0,0 +1,62 @@
+import asyncio
+import atexit
+import threading
+import weakref
+import httpx
+from config import HTTPConfig
+
+_client = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()  # event loop: httpx.AsyncClient
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _client_options() -> dict:
+    return {
+        'http2': HTTPConfig.HTTP2 and _http2_available(),
+        'limits': httpx.Limits(
+            max_connections=HTTPConfig.MAX_CONNECTIONS,
+            max_keepalive_connections=HTTPConfig.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTPConfig.KEEPALIVE_EXPIRY
+        ),
+        'timeout': httpx.Timeout(HTTPConfig.TIMEOUT, connect=HTTPConfig.CONNECT_TIMEOUT)
+    }
+
+
+def get_client() -> httpx.Client:
+    """Process-wide keep-alive client shared by the chat, weather and news modules"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled async client for the running event loop (async connections cannot cross loops)"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(**_client_options())
+        _async_clients[loop] = client
+    return client
+
+
+def close_client():
+    """Close pooled connections; the next get_client() builds a fresh client from HTTPConfig"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+atexit.register(close_client)
@@ -0,0 +1,131 @@
+import hashlib
+from pathlib import Path
+from typing import List, Sequence, Tuple
+import numpy as np
+from config import PathConfig
+from modules.intent_router import load_corpus
+
+# Character n-grams of the padded command are hashed into a fixed number of buckets,
+# so the model needs no vocabulary and its weight file stays a few tens of kilobytes.
+NGRAM_RANGE = (2, 4)
+HASH_BUCKETS = 4096  # a power of two
+_BUCKET_BITS = HASH_BUCKETS.bit_length() - 1
+FEATURE_VERSION = 1  # bump when featurisation changes so saved weights are retrained
+EPOCHS = 300
+LEARNING_RATE = 2.0
+L2 = 1e-4
+
+
+def _counts(texts: Sequence[str]) -> np.ndarray:
+    """Hashed n-gram counts for a batch, one row per text, computed over all texts at once"""
+    encoded = [f" {' '.join(text.lower().split())} ".encode('utf-8') for text in texts]
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint32)
+    rows = np.repeat(np.arange(len(texts)), [len(chunk) for chunk in encoded])
+    buckets = []
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        starts = len(data) - n + 1
+        if starts <= 0:
+            continue
+        hashes = np.zeros(starts, dtype=np.uint32)
+        for k in range(n):
+            hashes = hashes * np.uint32(257) + data[k:k + starts]  # wraps modulo 2**32
+        within = rows[:starts] == rows[n - 1:]  # drop n-grams spanning two texts
+        # Multiplicative hashing: the top bits of the product pick the bucket
+        bucket = (hashes * np.uint32(2654435761)) >> np.uint32(32 - _BUCKET_BITS)
+        buckets.append(rows[:starts][within] * HASH_BUCKETS + bucket[within])
+    flat = np.concatenate(buckets) if buckets else np.zeros(0, dtype=np.int64)
+    counts = np.bincount(flat, minlength=len(texts) * HASH_BUCKETS)
+    return counts.reshape(len(texts), HASH_BUCKETS).astype(np.float32)
+
+
+def _tfidf(counts: np.ndarray, idf: np.ndarray) -> np.ndarray:
+    features = np.log1p(counts) * idf
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-12)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _training_digest(path: Path) -> str:
+    # Hash the text with normalised line endings so a CRLF checkout matches the shipped model
+    digest = hashlib.sha1(Path(path).read_text(encoding='utf-8').replace("\r\n", "\n").encode('utf-8'))
+    digest.update(f"{FEATURE_VERSION}:{NGRAM_RANGE}:{HASH_BUCKETS}".encode())
+    return digest.hexdigest()
+
+
+class IntentClassifier:
+    """Character n-gram TF-IDF and a softmax linear model, for commands the keyword router misses"""
+
+    def __init__(self, classes: Sequence[str], idf: np.ndarray, weights: np.ndarray, bias: np.ndarray):
+        self.classes = list(classes)
+        self.idf = idf.astype(np.float32)
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+
+    @classmethod
+    def train(cls, examples: Sequence[Tuple[str, str]]) -> "IntentClassifier":
+        """Fit on (intent, command) pairs with full-batch gradient descent"""
+        classes = sorted({intent for intent, _ in examples})
+        counts = _counts([command for _, command in examples])
+        document_frequency = (counts > 0).sum(axis=0)
+        idf = (np.log((1 + len(examples)) / (1 + document_frequency)) + 1).astype(np.float32)
+        features = _tfidf(counts, idf)
+        targets = np.zeros((len(examples), len(classes)), dtype=np.float32)
+        targets[np.arange(len(examples)), [classes.index(intent) for intent, _ in examples]] = 1.0
+
+        weights = np.zeros((HASH_BUCKETS, len(classes)), dtype=np.float32)
+        bias = np.zeros(len(classes), dtype=np.float32)
+        for _ in range(EPOCHS):
+            error = (_softmax(features @ weights + bias) - targets) / len(examples)
+            weights -= LEARNING_RATE * (features.T @ error + L2 * weights)
+            bias -= LEARNING_RATE * error.sum(axis=0)
+        return cls(classes, idf, weights, bias)
+
+    @classmethod
+    def load(cls, model_path: Path = None, training_path: Path = None) -> "IntentClassifier":
+        """Load the precomputed weights, retraining in memory if they are missing or out of date;
+        python -m modules.intent_classifier saves freshly trained weights"""
+        model_path = Path(model_path or PathConfig.INTENT_MODEL)
+        training_path = Path(training_path or PathConfig.INTENT_TRAINING)
+        digest = _training_digest(training_path)
+        if model_path.exists():
+            with np.load(model_path) as saved:
+                if str(saved['training_digest']) == digest:
+                    return cls(saved['classes'].tolist(), saved['idf'], saved['weights'], saved['bias'])
+        print(f"{model_path} is missing or out of date; training the intent classifier in memory")
+        return cls.train(load_corpus(training_path))
+
+    @classmethod
+    def build(cls, model_path: Path = None, training_path: Path = None) -> "IntentClassifier":
+        """Train on the training set and save the weights with its digest"""
+        model_path = Path(model_path or PathConfig.INTENT_MODEL)
+        training_path = Path(training_path or PathConfig.INTENT_TRAINING)
+        model = cls.train(load_corpus(training_path))
+        model.save(model_path, _training_digest(training_path))
+        return model
+
+    def save(self, model_path: Path, training_digest: str):
+        # float16 halves the file; the scores lose nothing that matters for an argmax
+        np.savez_compressed(model_path, classes=np.array(self.classes), idf=self.idf.astype(np.float16),
+                            weights=self.weights.astype(np.float16), bias=self.bias,
+                            training_digest=np.array(training_digest))
+
+    def predict_proba(self, commands: Sequence[str]) -> np.ndarray:
+        """Class probabilities, one row per command, columns in self.classes order"""
+        return _softmax(_tfidf(_counts(commands), self.idf) @ self.weights + self.bias)
+
+    def predict(self, commands: Sequence[str]) -> List[Tuple[str, float]]:
+        """(intent, probability) of the most likely class for each command"""
+        probabilities = self.predict_proba(commands)
+        best = probabilities.argmax(axis=1)
+        return [(self.classes[index], float(probabilities[row, index])) for row, index in enumerate(best)]
+
+
+if __name__ == '__main__':
+    # python -m modules.intent_classifier  -> retrain and save the shipped weights after editing the training set
+    IntentClassifier.build()
+    print(f"Trained on {PathConfig.INTENT_TRAINING}, saved to {PathConfig.INTENT_MODEL}")
@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (intent, phrases, weight, lead_weight). Phrases are '|'-separated word sequences in
+# which "<num>" (not as the first word) matches any number or clock time. lead_weight
+# applies instead of weight when the phrase opens the command (after fillers such as
+# "hey friday, please"), which is where imperative verbs like "stop" carry their meaning.
+INTENT_RULES: Sequence[Tuple[str, str, float, Optional[float]]] = [
+    ("weather", "weather|forecast|temperature|humidity|humid", 3.0, None),
+    ("weather", "rain|raining|rainy|snow|snowing|snowy|wind|windy|sunny|cloudy|umbrella|outside", 1.5, None),
+    ("weather", "degrees|hot|cold|warm|tomorrow", 0.5, None),
+    ("news", "news|headline|headlines", 3.0, None),
+    ("news", "article|articles|stories|happening in the world", 1.5, None),
+    ("news", "technology|science|business|sports|entertainment", 0.5, None),
+    ("news", "latest|recent|update|updates|today's", 0.5, None),
+    ("reminder", "remind|reminder|reminders|alarm|timer|wake me", 3.0, None),
+    ("reminder", "in <num> minutes|in <num> hours|in <num> seconds|after <num> minutes|"
+                 "after <num> hours|in <num> minute|in <num> hour|at <num>", 0.75, None),
+    ("system", "volume|mute|unmute", 3.0, None),
+    ("system", "shutdown|shut down|restart|reboot", 1.0, 3.0),
+    ("system", "computer|system|pc|laptop", 0.5, None),
+    ("system", "open|launch|start|close|quit|exit", 0.5, 2.0),
+    ("system", "play|pause|stop|resume|sleep", 0.5, 2.5),
+    ("system", "chrome|youtube|notepad|music|song|media", 1.0, None),
+]
+CHAT_PRIOR = 1.0  # score the fallback intent always has; others must beat it to win
+LEAD_FILLERS = {"hey", "hi", "ok", "okay", "friday", "please", "kindly", "can", "could", "would", "will", "you"}
+
+# Commands are split into words by one bytes.translate that lowercases ASCII letters and
+# turns everything but letters, digits and apostrophes into spaces (so "6:30" reads as
+# "6 30"), which costs a third of a regex findall.
+_WORD_BYTES = b"abcdefghijklmnopqrstuvwxyz0123456789'"
+_TOKENS = bytes(i if i in _WORD_BYTES else i + 32 if 65 <= i <= 90 else 32 for i in range(256))
+_NUM = b"<num>"
+_LEAD_FILLERS = frozenset(word.encode() for word in LEAD_FILLERS)
+
+
+class IntentRouter:
+    """Scores every intent in a single pass over the command's words.
+
+    All phrases are compiled into one word trie, so each word costs a dict lookup
+    instead of a regex search per intent.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, str, float, Optional[float]]] = INTENT_RULES,
+                 fallback: str = "chat", fallback_prior: float = CHAT_PRIOR):
+        self.fallback = fallback
+        self.fallback_prior = fallback_prior
+        self.intents = list(dict.fromkeys(rule[0] for rule in rules))
+        # node: {word: (child node, [(intent index, weight, lead_weight), ...])}
+        self._trie: Dict = {}
+        for intent, phrases, weight, lead in rules:
+            target = (self.intents.index(intent), weight, weight if lead is None else lead)
+            for phrase in phrases.split("|"):
+                node, words = self._trie, phrase.encode().split()
+                for word in words[:-1]:
+                    node = node.setdefault(word, ({}, []))[0]
+                node.setdefault(words[-1], ({}, []))[1].append(target)
+
+    def _score(self, command: str) -> List[float]:
+        words = command.encode().translate(_TOKENS).split()
+        lead = 0
+        while lead < len(words) and words[lead] in _LEAD_FILLERS:
+            lead += 1
+        scores = [0.0] * len(self.intents)
+        for start, entry in enumerate(map(self._trie.get, words)):
+            position = start
+            while entry is not None:
+                for index, weight, lead_weight in entry[1]:
+                    scores[index] += lead_weight if start == lead else weight
+                children = entry[0]
+                position += 1
+                if position == len(words) or not children:
+                    break
+                following = words[position]
+                entry = children.get(following) or (children.get(_NUM) if 48 <= following[0] <= 57 else None)
+        return scores
+
+    def scores(self, command: str) -> Dict[str, float]:
+        """Raw score per intent, the fallback included"""
+        scores = dict(zip(self.intents, self._score(command)))
+        scores[self.fallback] = self.fallback_prior
+        return scores
+
+    def rank(self, command: str) -> List[Tuple[str, float]]:
+        """(intent, confidence) pairs, most likely first; confidences sum to 1"""
+        scores = self.scores(command)
+        total = sum(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(intent, score / total) for intent, score in ranked]
+
+    def route(self, command: str) -> str:
+        """Highest scoring intent, or the fallback unless another beats its prior"""
+        scores = self._score(command)
+        best = max(scores)
+        return self.intents[scores.index(best)] if best > self.fallback_prior else self.fallback
+
+
+def load_corpus(path) -> List[Tuple[str, str]]:
+    """(intent, command) pairs from a tab-separated file; '#' lines are comments"""
+    examples = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line and not line.startswith("#"):
+                intent, command = line.split("\t", 1)
+                examples.append((intent, command))
+    return examples
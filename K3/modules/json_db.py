@@ -1,8 +1,18 @@
+import atexit
+import copy
 import json
+import os
 import threading
-from datetime import datetime
-from pathlib import Path
-from config import PathConfig
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from config import PathConfig, DatabaseConfig
+from modules.search_index import HistoryIndex
+from modules.json_state import default_user_data, replay_journal
+
+
+def _timestamp(value: Union[str, datetime]) -> str:
+    return str(value) if isinstance(value, datetime) else value
 
 class JSONDatabase:
     _instance = None
@@ -18,62 +28,222 @@ class JSONDatabase:
 
     def _initialize(self):
         self.file_path = PathConfig.USER_DATA_FILE
+        self.journal_path = PathConfig.USER_DATA_JOURNAL
+        self.rotated_journal_path = self.journal_path.with_name(self.journal_path.name + ".old")
+        self._write_lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()  # one compaction or save at a time
+        self._journal = None
+        self._journal_seq = 0
+        self._compacting = False
         if not self.file_path.exists():
             self._create_default_db()
         self._load_data()
+        self.search_index = HistoryIndex(self.file_path.with_name(self.file_path.name + ".index"))
+        self._sync_search_index()
+        atexit.register(self.search_index.save)
 
     def _create_default_db(self):
-        default_data = {
-            "user_preferences": {
-                "name": "User",
-                "location": {"city": "New York", "country": "US"},
-                "news_preferences": {"categories": ["technology", "science"], "language": "en", "sources": []},
-                "theme": "dark",
-                "voice_enabled": True
-            },
-            "chat_history": [],
-            "system_settings": {
-                "default_apps": {"browser": "chrome", "music": "spotify", "editor": "notepad"}
-            }
-        }
         with open(self.file_path, 'w') as f:
-            json.dump(default_data, f, indent=4)
+            json.dump(default_user_data(), f, indent=4)
 
     def _load_data(self):
+        """Load the last snapshot and replay any journaled mutations over it"""
         with open(self.file_path, 'r') as f:
             self.data = json.load(f)
+        self._journal_seq = self.data.pop('journal_seq', 0)
+        for path in (self.rotated_journal_path, self.journal_path):
+            self._journal_seq = replay_journal(self.data, path, self._journal_seq)
+
+        # A leftover rotated journal means a compaction was interrupted
+        if self.rotated_journal_path.exists():
+            self.save()
+        elif self.journal_path.exists() and self.journal_path.stat().st_size >= DatabaseConfig.JOURNAL_COMPACT_BYTES:
+            self._start_compaction()
+
+    def _sync_search_index(self):
+        """Index whatever was added since the index was last saved"""
+        history = self.data.get('chat_history', [])
+        if self.search_index.last_doc_id >= len(history):
+            self.search_index.clear()
+        start = self.search_index.last_doc_id + 1
+        self.search_index.add_many((i, history[i]['message']) for i in range(start, len(history)))
+
+    def _persist(self, record: dict):
+        """Record a mutation that has already been applied to self.data"""
+        with self._write_lock:
+            self._journal_seq += 1
+            if not DatabaseConfig.JOURNAL_ENABLED:
+                self._write_snapshot(self._snapshot())
+                return
+            record['seq'] = self._journal_seq
+            if self._journal is None:
+                self._journal = self._open_journal()
+            self._journal.write(json.dumps(record) + '\n')
+            self._journal.flush()
+            if self._journal.tell() >= DatabaseConfig.JOURNAL_COMPACT_BYTES:
+                self._start_compaction()
+
+    def _open_journal(self):
+        journal = open(self.journal_path, 'a', encoding='utf-8')
+        # Terminate a torn trailing record so the next one starts on its own line
+        if journal.tell() > 0:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    journal.write('\n')
+        return journal
+
+    def _rotate_journal(self):
+        """Move the live journal aside so new writes start a fresh one (caller holds the lock)"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if not self.journal_path.exists():
+            return
+        if self.rotated_journal_path.exists():
+            # An earlier compaction failed; keep its records too
+            with open(self.rotated_journal_path, 'a', encoding='utf-8') as dst, \
+                    open(self.journal_path, 'r', encoding='utf-8') as src:
+                dst.write(src.read())
+            self.journal_path.unlink()
+        else:
+            os.replace(self.journal_path, self.rotated_journal_path)
+
+    def _snapshot(self) -> dict:
+        """Copy of the current state (caller holds the lock)"""
+        # Chat entries are never mutated in place, so a shallow list copy is enough
+        snapshot = {key: list(value) if key == 'chat_history' else copy.deepcopy(value)
+                    for key, value in self.data.items()}
+        snapshot['journal_seq'] = self._journal_seq
+        return snapshot
+
+    def _write_snapshot(self, snapshot: dict):
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, indent=4)
+        os.replace(tmp_path, self.file_path)
+        self.rotated_journal_path.unlink(missing_ok=True)
+
+    def _start_compaction(self):
+        with self._write_lock:
+            if self._compacting:
+                return
+            self._compacting = True
+        threading.Thread(target=self._compact, daemon=True).start()
+
+    def _compact(self):
+        """Fold the journal into a new snapshot without blocking writers"""
+        try:
+            self.save()
+        except Exception as e:
+            print(f"Journal compaction error: {e}")
+        finally:
+            self._compacting = False
 
     def save(self):
-        with open(self.file_path, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        """Write a full snapshot and discard the journal"""
+        with self._snapshot_lock:
+            # Writers are only held up while the journal is swapped and the state copied
+            with self._write_lock:
+                self._rotate_journal()
+                snapshot = self._snapshot()
+            self._write_snapshot(snapshot)
 
     def get_user_preferences(self):
         return self.data.get('user_preferences', {})
 
     def update_user_preferences(self, preferences):
-        self.data['user_preferences'] = preferences
-        self.save()
+        with self._write_lock:
+            self.data['user_preferences'] = preferences
+            self._persist({'op': 'set', 'key': 'user_preferences', 'value': preferences})
+
+    def get_chat_history(self, limit: Optional[int] = None,
+                         before: Union[str, datetime, None] = None) -> List[Dict]:
+        """Chat messages in chronological order, optionally the last `limit` older than `before`"""
+        history = self.data.get('chat_history', [])
+        if limit is None and before is None:
+            return history
+        end = len(history)
+        if before is not None:
+            end = bisect_left(history, _timestamp(before), key=lambda m: m['timestamp'])
+        start = 0 if limit is None else max(0, end - limit)
+        return history[start:end]
+
+    def count_chat_messages(self, sender: Optional[str] = None) -> int:
+        history = self.data.get('chat_history', [])
+        if sender is None:
+            return len(history)
+        return sum(1 for m in history if m['sender'] == sender)
 
-    def get_chat_history(self):
-        return self.data.get('chat_history', [])
+    def get_chat_history_between(self, start: Union[str, datetime],
+                                 end: Union[str, datetime]) -> List[Dict]:
+        """Chat messages with start <= timestamp < end"""
+        history = self.data.get('chat_history', [])
+        key = lambda m: m['timestamp']
+        lo = bisect_left(history, _timestamp(start), key=key)
+        hi = bisect_left(history, _timestamp(end), key=key)
+        return history[lo:hi]
 
     def add_chat_message(self, sender, message):
-        self.data['chat_history'].append({
+        entry = {
             'sender': sender,
             'message': message,
             'timestamp': str(datetime.now())
-        })
-        self.save()
+        }
+        with self._write_lock:
+            self.data['chat_history'].append(entry)
+            self._persist({'op': 'chat', 'entry': entry})
+            self.search_index.add(len(self.data['chat_history']) - 1, message)
+
+    def add_chat_messages(self, messages: Iterable[Tuple[str, str]]):
+        """Append (sender, message) pairs in order with a single journal write"""
+        now = datetime.now()
+        # A microsecond apart so every entry keeps a distinct, ordered timestamp
+        entries = [{'sender': sender, 'message': message, 'timestamp': str(now + timedelta(microseconds=i))}
+                   for i, (sender, message) in enumerate(messages)]
+        if not entries:
+            return
+        with self._write_lock:
+            history = self.data['chat_history']
+            first = len(history)
+            history.extend(entries)
+            self._persist({'op': 'chats', 'entries': entries})
+            self.search_index.add_many((first + i, entry['message']) for i, entry in enumerate(entries))
+
+    def get_conversation_summary(self) -> Dict:
+        """{'summary': text, 'upto': timestamp of the newest message folded in}; empty before the first summary"""
+        return self.data.get('conversation_summary', {})
+
+    def set_conversation_summary(self, summary: str, upto: str):
+        value = {'summary': summary, 'upto': upto}
+        with self._write_lock:
+            self.data['conversation_summary'] = value
+            self._persist({'op': 'set', 'key': 'conversation_summary', 'value': value})
+
+    def search_history(self, query: str, k: int = 5) -> List[Dict]:
+        """Best matching chat messages for query, each with a BM25 'score'"""
+        history = self.data.get('chat_history', [])
+        return [dict(history[doc_id], score=score)
+                for doc_id, score in self.search_index.search(query, k) if doc_id < len(history)]
 
     def clear_chat_history(self):
-        self.data['chat_history'] = []
-        self.save()
+        with self._write_lock:
+            self.data['chat_history'] = []
+            self.data.pop('conversation_summary', None)
+            self._persist({'op': 'clear_chat'})
+            self.search_index.clear()
+        self.search_index.save()
 
     def get_system_settings(self):
         return self.data.get('system_settings', {})
 
     def update_system_settings(self, settings):
-        self.data['system_settings'] = settings
-        self.save()
+        with self._write_lock:
+            self.data['system_settings'] = settings
+            self._persist({'op': 'set', 'key': 'system_settings', 'value': settings})
 
-db = JSONDatabase()
+if DatabaseConfig.BACKEND == "sqlite":
+    from modules.sqlite_db import SQLiteDatabase
+    db = SQLiteDatabase()
+else:
+    db = JSONDatabase()
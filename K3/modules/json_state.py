@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+from typing import Dict
+
+# The user_data.json format: defaults, journal replay and loading. Kept apart from
+# json_db so tools such as the SQLite migration can read the data without importing
+# json_db, which opens the database as a side effect.
+
+
+def default_user_data() -> Dict:
+    return {
+        "user_preferences": {
+            "name": "User",
+            "location": {"city": "New York", "country": "US"},
+            "news_preferences": {"categories": ["technology", "science"], "language": "en", "sources": []},
+            "theme": "dark",
+            "voice_enabled": True
+        },
+        "chat_history": [],
+        "system_settings": {
+            "default_apps": {"browser": "chrome", "music": "spotify", "editor": "notepad"}
+        }
+    }
+
+
+def apply_journal_record(data: Dict, record: Dict):
+    op = record['op']
+    if op == 'chat':
+        data.setdefault('chat_history', []).append(record['entry'])
+    elif op == 'chats':
+        data.setdefault('chat_history', []).extend(record['entries'])
+    elif op == 'clear_chat':
+        data['chat_history'] = []
+        data.pop('conversation_summary', None)
+    elif op == 'set':
+        data[record['key']] = record['value']
+
+
+def replay_journal(data: Dict, path: Path, seq: int = 0) -> int:
+    """Apply journal records newer than seq to data and return the last applied seq"""
+    if not path.exists():
+        return seq
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write from a crash
+            if record.get('seq', 0) <= seq:
+                continue  # already folded into the snapshot
+            apply_journal_record(data, record)
+            seq = record['seq']
+    return seq
+
+
+def load_json_state(file_path: Path, journal_path: Path) -> Dict:
+    """Read a snapshot plus its journals without touching the db singleton"""
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    seq = data.pop('journal_seq', 0)
+    for path in (journal_path.with_name(journal_path.name + ".old"), journal_path):
+        seq = replay_journal(data, path, seq)
+    return data
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from config import CalibrationConfig, PathConfig
+
+
+def device_key(microphone) -> str:
+    """A stable name for the input device a speech_recognition Microphone records from"""
+    index = getattr(microphone, 'device_index', None)
+    try:
+        import pyaudio
+        audio = pyaudio.PyAudio()
+        try:
+            info = (audio.get_default_input_device_info() if index is None
+                    else audio.get_device_info_by_index(index))
+            return info['name']
+        finally:
+            audio.terminate()
+    except Exception:
+        return "default" if index is None else f"device {index}"
+
+
+class CalibrationStore:
+    """Energy thresholds per input device, kept in mic_calibration.json so startup can skip calibrating"""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or PathConfig.MIC_CALIBRATION_FILE)
+        self._devices: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r') as f:
+                self._devices = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading microphone calibration: {e}")
+
+    def get(self, device: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._devices.get(device)
+            return dict(entry) if entry else None
+
+    def update(self, device: str, energy_threshold: float, noise_rms: float, full: bool = False):
+        """Record a threshold; full means it came from a recalibration rather than a small adjustment"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            entry = self._devices.setdefault(device, {'calibrated_at': now})
+            entry['energy_threshold'] = round(energy_threshold, 1)
+            entry['noise_rms'] = round(noise_rms, 1)
+            entry['updated_at'] = now
+            if full:
+                entry['calibrated_at'] = now
+            snapshot = json.dumps(self._devices, indent=2)
+        try:
+            os.makedirs(self.path.parent, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, 'w') as f:
+                f.write(snapshot)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error saving microphone calibration: {e}")
+
+
+class AdaptiveThreshold:
+    """Keeps an energy threshold matched to the room from the frames seen while listening.
+
+    Quiet frames (outside utterances and below the threshold) move the noise estimate
+    with an exponential moving average. Separately, a drift detector takes a low
+    percentile of the recent frames from outside utterances; if that floor is
+    DRIFT_RATIO away from the estimate, the estimate is reset to it. Speech never
+    enters that window, so a long conversation cannot pull the floor up.
+
+    Noise louder than the threshold, for instance a fan coming on, makes every frame
+    count as speech, so the quiet window stops filling. When STUCK_SHARE of the last
+    STUCK_SECONDS were inside utterances the estimate is reset to the low percentile of
+    those frames instead: real speech has pauses long enough to end an utterance well
+    within that time. Either reset is a full recalibration, made from audio already captured.
+    """
+
+    def __init__(self, noise_rms: float, frame_ms: int,
+                 on_update: Optional[Callable[[float, float, bool], None]] = None):
+        self.noise_rms = noise_rms
+        self.on_update = on_update  # (threshold, noise_rms, full) whenever the estimate is saved
+        self.recalibrations = 0
+        self._alpha = min(1.0, frame_ms / 1000 / CalibrationConfig.ADAPT_SECONDS)
+        self._quiet = deque(maxlen=max(1, int(CalibrationConfig.DRIFT_WINDOW_SECONDS * 1000 / frame_ms)))
+        self._recent = deque(maxlen=max(1, int(CalibrationConfig.STUCK_SECONDS * 1000 / frame_ms)))
+        self._recent_speech = 0  # frames in _recent that were inside an utterance
+        self._check_every = max(1, 1000 // frame_ms)  # about once a second
+        self._save_every = max(1, int(CalibrationConfig.SAVE_INTERVAL_SECONDS * 1000 / frame_ms))
+        self._frames = 0
+        self.threshold = self._threshold()
+
+    @classmethod
+    def from_threshold(cls, energy_threshold: float, frame_ms: int, **kwargs) -> "AdaptiveThreshold":
+        return cls(energy_threshold / CalibrationConfig.NOISE_RATIO, frame_ms, **kwargs)
+
+    def _threshold(self) -> float:
+        return max(CalibrationConfig.MIN_THRESHOLD, self.noise_rms * CalibrationConfig.NOISE_RATIO)
+
+    @staticmethod
+    def _floor(energies) -> float:
+        ordered = sorted(energies)
+        return ordered[len(ordered) * CalibrationConfig.DRIFT_PERCENTILE // 100]
+
+    def _drifted_floor(self) -> Optional[float]:
+        """A new noise floor if the room has drifted from the estimate, otherwise None"""
+        if len(self._quiet) == self._quiet.maxlen:
+            floor = self._floor(self._quiet)
+            ratio = CalibrationConfig.DRIFT_RATIO
+            if floor > self.noise_rms * ratio or floor * ratio < self.noise_rms:
+                return floor
+        if (len(self._recent) == self._recent.maxlen
+                and self._recent_speech >= CalibrationConfig.STUCK_SHARE * len(self._recent)):
+            return self._floor(rms for rms, _ in self._recent)
+        return None
+
+    def observe(self, rms: float, in_speech: bool) -> float:
+        """Feed one frame's energy; returns the threshold to use from now on"""
+        self._frames += 1
+        if not in_speech:
+            self._quiet.append(rms)
+            if rms <= self.threshold:
+                self.noise_rms += self._alpha * (rms - self.noise_rms)
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_speech -= self._recent[0][1]
+        self._recent.append((rms, in_speech))
+        self._recent_speech += in_speech
+        full = False
+        if self._frames % self._check_every == 0:
+            floor = self._drifted_floor()
+            if floor is not None:
+                self.noise_rms = floor
+                self.recalibrations += 1
+                self._quiet.clear()
+                self._recent.clear()
+                self._recent_speech = 0
+                full = True
+        self.threshold = self._threshold()
+        if self.on_update and (full or self._frames % self._save_every == 0):
+            self.on_update(self.threshold, self.noise_rms, full)
+        return self.threshold
@@ -1,18 +1,27 @@
-import requests
-from typing import List, Dict
-from config import APIConfig, AssistantConfig
+import threading
+from typing import Callable, List, Dict, Optional
+from config import APIConfig, AssistantConfig, CacheConfig
 from modules.json_db import db
+from modules.http_client import get_client, get_async_client
+from modules.cache import TTLCache
+from modules.singleflight import SingleFlight
+from modules.resilience import Upstream, upstream_timeout
 
 class NewsModule:
     def __init__(self):
         self.api_key = APIConfig.NEWS_API_KEY
         self.base_url = APIConfig.NEWS_API_URL
+        # key: (category, language, sources, page size) -> {'count': page size, 'articles': [...]}
+        self.cache = TTLCache(CacheConfig.NEWS_TTL, CacheConfig.NEWS_MAX_ENTRIES, CacheConfig.NEWS_STALE_TTL)
+        self.flight = SingleFlight()  # concurrent fetches of the same page share one request
+        self.upstream = Upstream("newsapi")
+        self._prefetch_stop = threading.Event()
+        self._prefetch_thread = None
 
-    def get_news(self, category=None, count=5):
+    def _build_params(self, category=None) -> Dict:
         prefs = db.get_user_preferences().get('news_preferences', {})
         params = {
             'apiKey': self.api_key,
-            'pageSize': count,
             'language': prefs.get('language', 'en')
         }
         if category:
@@ -21,10 +30,99 @@ class NewsModule:
             params['category'] = prefs['categories'][0]
         if prefs.get('sources'):
             params['sources'] = ','.join(prefs['sources'])
+        return params
+
+    @staticmethod
+    def _cache_key(params: Dict, count: int) -> tuple:
+        return params.get('category'), params['language'], params.get('sources'), count
+
+    @staticmethod
+    def _page(data: Dict, count: int) -> Optional[Dict]:
+        """A cacheable page, or None when the API returned no articles so nothing empty gets cached"""
+        articles = data.get('articles') or []
+        return {'count': count, 'articles': articles} if articles else None
+
+    def _larger_page(self, params: Dict, count: int, lookup: Callable[[tuple], Optional[Dict]]) -> Optional[Dict]:
+        """A page cached for these params with more than count articles requested, smallest first"""
+        prefix = self._cache_key(params, count)[:-1]
+        for size in sorted(key[-1] for key in self.cache.keys() if key[:-1] == prefix and key[-1] > count):
+            page = lookup(prefix + (size,))
+            if page:
+                return page
+        return None
+
+    def _fetch_page(self, params: Dict, count: int) -> Optional[Dict]:
+        return self.flight.do(self._cache_key(params, count), lambda: self._request_page(params, count))
+
+    def _request_page(self, params: Dict, count: int) -> Optional[Dict]:
+        def attempt(timeout):
+            resp = get_client().get(self.base_url, params=dict(params, pageSize=count), timeout=timeout)
+            resp.raise_for_status()
+            return resp.json()
         try:
-            resp = requests.get(self.base_url, params=params)
+            return self._page(self.upstream.call(attempt, upstream_timeout("news")), count)
+        except Exception:
+            return None
+
+    async def _fetch_page_async(self, params: Dict, count: int) -> Optional[Dict]:
+        return await self.flight.do_async(self._cache_key(params, count),
+                                          lambda: self._request_page_async(params, count))
+
+    async def _request_page_async(self, params: Dict, count: int) -> Optional[Dict]:
+        async def attempt(timeout):
+            resp = await get_async_client().get(self.base_url, params=dict(params, pageSize=count),
+                                                timeout=timeout)
             resp.raise_for_status()
-            data = resp.json()
-            return data.get('articles', [])
-        except:
-            return []
+            return resp.json()
+        try:
+            return self._page(await self.upstream.call_async(attempt, upstream_timeout("news")), count)
+        except Exception:
+            return None
+
+    def get_news(self, category=None, count=5):
+        params = self._build_params(category)
+        # Small requests share the standard page; larger ones get a page of their own size.
+        # A fresh page fetched for a larger request serves smaller ones too.
+        page_size = max(count, CacheConfig.NEWS_PAGE_SIZE)
+        key = self._cache_key(params, page_size)
+        page = (self._larger_page(params, page_size, self.cache.get)
+                or self.cache.get_or_fetch(key, lambda: self._fetch_page(params, page_size)))
+        # out-of-date headlines beat none while the API is down
+        page = page or self.cache.peek(key) or self._larger_page(params, page_size, self.cache.peek)
+        return page['articles'][:count] if page else []
+
+    async def get_news_async(self, category=None, count=5):
+        params = self._build_params(category)
+        page_size = max(count, CacheConfig.NEWS_PAGE_SIZE)
+        key = self._cache_key(params, page_size)
+        page = (self._larger_page(params, page_size, self.cache.get)
+                or await self.cache.get_or_fetch_async(key, lambda: self._fetch_page_async(params, page_size),
+                                                       lambda: self._fetch_page(params, page_size)))
+        # out-of-date headlines beat none while the API is down
+        page = page or self.cache.peek(key) or self._larger_page(params, page_size, self.cache.peek)
+        return page['articles'][:count] if page else []
+
+    def start_prefetch(self):
+        """Keep the user's preferred categories warm from a background thread"""
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        self._prefetch_stop.clear()
+        self._prefetch_thread = threading.Thread(target=self._prefetch_loop, name="news-prefetch", daemon=True)
+        self._prefetch_thread.start()
+
+    def stop_prefetch(self):
+        self._prefetch_stop.set()
+
+    def _prefetch_loop(self):
+        while not self._prefetch_stop.is_set():
+            prefs = db.get_user_preferences().get('news_preferences', {})
+            categories = prefs.get('categories') or [AssistantConfig.DEFAULT_NEWS_CATEGORY]
+            for category in categories:
+                params = self._build_params(category)
+                page = self._fetch_page(params, CacheConfig.NEWS_PAGE_SIZE)
+                if page:  # a failed or empty fetch leaves the cached page in place
+                    self.cache.put(self._cache_key(params, CacheConfig.NEWS_PAGE_SIZE), page)
+            self._prefetch_stop.wait(CacheConfig.NEWS_PREFETCH_INTERVAL)
+
+    def cache_stats(self) -> Dict:
+        return dict(self.cache.stats(), **self.flight.stats(), upstream=self.upstream.stats())
@@ -0,0 +1,176 @@
+import calendar
+import re
+from datetime import datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+
+# A recurrence rule is a small dict stored with the reminder, e.g.
+#   {"freq": "hourly", "interval": 1, "start": "2025-06-17T10:00:00"}
+#   {"freq": "monthly", "interval": 1, "day": 5, "start": "2025-07-05T09:00:00"}
+# Only the next occurrence is ever computed from it.
+
+WEEKDAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_UNIT_FREQ = {"minute": "minutely", "hour": "hourly", "day": "daily", "week": "weekly", "month": "monthly"}
+_STEPS = {"minutely": "minutes", "hourly": "hours", "daily": "days", "weekly": "weeks"}
+DEFAULT_TIME = time(9, 0)
+
+_EVERY_N = re.compile(r"\bevery\s+(?:(\d+|other)\s+)?(minute|hour|day|week|month)s?\b")
+_WEEKDAYS = re.compile(r"\b(?:every\s+(?:weekday|workday)|on\s+weekdays|weekdays)\b")
+_DAYNAME = "(" + "|".join(WEEKDAY_NAMES) + ")"
+_EVERY_DAYNAME = re.compile(r"\b(?:every\s+" + _DAYNAME + r"s?|on\s+" + _DAYNAME + r"s)\b")
+# "daily" and friends are only a schedule when they end the command or lead into its time
+# ("take pills daily", "daily at 8am"); in "send the weekly report" they describe the task
+_ADVERB = re.compile(r"\b(hourly|daily|weekly|monthly)\b(?=\s+at\s+(?:\d|noon\b|midnight\b)|\s*[.!?]*\s*$)")
+_DAY_OF_MONTH = re.compile(r"\b(?:on\s+(?:the\s+)?(?:day\s+)?|the\s+|day\s+)(\d{1,2})(?:st|nd|rd|th)?\b")
+_OF_EVERY_MONTH = re.compile(r"\b(?:on\s+)?(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\s+of\s+(?:every|each)\s+month\b")
+_TIME_OF_DAY = re.compile(r"\bat\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\b|\bat\s+(noon|midnight)\b")
+
+
+def _parse_time_of_day(text: str) -> Tuple[Optional[time], str]:
+    match = _TIME_OF_DAY.search(text)
+    if not match:
+        return None, text
+    if match.group(4):
+        parsed = time(12, 0) if match.group(4) == "noon" else time(0, 0)
+    else:
+        hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+        if meridiem == "pm" and hour < 12:
+            hour += 12
+        elif meridiem == "am" and hour == 12:
+            hour = 0
+        if hour > 23 or minute > 59:
+            return None, text
+        parsed = time(hour, minute)
+    return parsed, text[:match.start()] + text[match.end():]
+
+
+def parse_recurrence(text: str, now: Optional[datetime] = None) -> Tuple[Optional[Dict], str]:
+    """Find a recurrence phrase in text; returns (rule, text with the phrase removed)"""
+    text = text.lower()
+    now = now or datetime.now()
+    spec = {"interval": 1}
+
+    match = _OF_EVERY_MONTH.search(text)
+    if match:
+        spec.update(freq="monthly", day=int(match.group(1)))
+    else:
+        match = _WEEKDAYS.search(text)
+        if match:
+            spec["freq"] = "weekdays"
+        else:
+            match = _EVERY_DAYNAME.search(text)
+            if match:
+                spec.update(freq="weekly", weekday=WEEKDAY_NAMES.index(match.group(1) or match.group(2)))
+            else:
+                match = _EVERY_N.search(text) or _ADVERB.search(text)
+                if not match:
+                    return None, text
+                if match.re is _EVERY_N:
+                    count = match.group(1)
+                    spec["interval"] = 2 if count == "other" else int(count or 1)
+                    spec["freq"] = _UNIT_FREQ[match.group(2)]
+                else:
+                    spec["freq"] = match.group(1)
+    if spec["interval"] < 1:
+        return None, text
+    rest = text[:match.start()] + text[match.end():]
+
+    if spec["freq"] == "monthly" and "day" not in spec:
+        day_match = _DAY_OF_MONTH.search(rest)
+        if day_match and 1 <= int(day_match.group(1)) <= 31:
+            spec["day"] = int(day_match.group(1))
+            rest = rest[:day_match.start()] + rest[day_match.end():]
+
+    time_of_day, rest = _parse_time_of_day(rest)
+    spec["start"] = _first_occurrence(spec, now, time_of_day).isoformat()
+    return spec, re.sub(r"\s+", " ", rest).strip()
+
+
+def _first_occurrence(rule: Dict, now: datetime, time_of_day: Optional[time]) -> datetime:
+    freq = rule["freq"]
+    base = now.replace(second=0, microsecond=0)
+    if freq in ("minutely", "hourly"):
+        step = timedelta(**{_STEPS[freq]: rule["interval"]})
+        if time_of_day is None:
+            return base + step
+        candidate = datetime.combine(now.date(), time_of_day)
+        while candidate <= now:
+            candidate += step
+        return candidate
+    if freq == "daily":
+        if time_of_day is None:
+            return base + timedelta(days=rule["interval"])
+        candidate = datetime.combine(now.date(), time_of_day)
+        return candidate if candidate > now else candidate + timedelta(days=rule["interval"])
+    if freq == "weekdays":
+        candidate = datetime.combine(now.date(), time_of_day or DEFAULT_TIME)
+        while candidate <= now or candidate.weekday() >= 5:
+            candidate += timedelta(days=1)
+        return candidate
+    if freq == "weekly":
+        if "weekday" not in rule:
+            if time_of_day is None:
+                return base + timedelta(weeks=rule["interval"])
+            rule["weekday"] = now.weekday()
+        candidate = datetime.combine(now.date(), time_of_day or DEFAULT_TIME)
+        candidate += timedelta(days=(rule["weekday"] - now.weekday()) % 7)
+        return candidate if candidate > now else candidate + timedelta(weeks=1)
+    # monthly
+    rule.setdefault("day", now.day)
+    candidate = _month_occurrence(now.year, now.month, rule["day"], time_of_day or DEFAULT_TIME)
+    if candidate <= now:
+        candidate = _add_months(candidate, 1, rule["day"])
+    return candidate
+
+
+def _month_occurrence(year: int, month: int, day: int, time_of_day: time) -> datetime:
+    # Months without the requested day fire on their last day instead
+    last_day = calendar.monthrange(year, month)[1]
+    return datetime.combine(datetime(year, month, min(day, last_day)).date(), time_of_day)
+
+
+def _add_months(moment: datetime, months: int, day: int) -> datetime:
+    index = moment.year * 12 + (moment.month - 1) + months
+    return _month_occurrence(index // 12, index % 12 + 1, day, moment.time())
+
+
+def next_occurrence(rule: Dict, after: datetime) -> datetime:
+    """The first occurrence strictly after `after`, in O(1) regardless of how many were missed"""
+    start = datetime.fromisoformat(rule["start"])
+    if after < start:
+        return start
+    freq = rule["freq"]
+    if freq in _STEPS:
+        step = timedelta(**{_STEPS[freq]: rule.get("interval", 1)})
+        return start + ((after - start) // step + 1) * step
+    if freq == "weekdays":
+        candidate = datetime.combine(after.date(), start.time())
+        if candidate <= after:
+            candidate += timedelta(days=1)
+        while candidate.weekday() >= 5:
+            candidate += timedelta(days=1)
+        return candidate
+    # monthly
+    interval = rule.get("interval", 1)
+    elapsed = (after.year - start.year) * 12 + after.month - start.month
+    months = elapsed // interval * interval
+    candidate = _add_months(start, months, rule["day"])
+    if candidate <= after:
+        candidate = _add_months(start, months + interval, rule["day"])
+    return candidate
+
+
+def describe_recurrence(rule: Dict) -> str:
+    start = datetime.fromisoformat(rule["start"])
+    interval = rule.get("interval", 1)
+    at = start.strftime("%I:%M %p")
+    freq = rule["freq"]
+    if freq in _STEPS:
+        unit = _STEPS[freq][:-1]
+        every = f"every {unit}" if interval == 1 else f"every {interval} {unit}s"
+        if freq == "weekly":
+            return f"{every} on {calendar.day_name[start.weekday()]} at {at}"
+        return every if freq in ("minutely", "hourly") else f"{every} at {at}"
+    if freq == "weekdays":
+        return f"every weekday at {at}"
+    every = "every month" if interval == 1 else f"every {interval} months"
+    return f"{every} on day {rule['day']} at {at}"
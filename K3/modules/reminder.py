@@ -1,43 +1,51 @@
-import threading
 import time
 import re
+import threading
 import json
 import os
-import pyttsx3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from config import PathConfig
+from typing import Callable, Dict, List, Optional
+from config import AssistantConfig, PathConfig
 from PyQt5.QtCore import QObject, pyqtSignal
-import dateparser
+from modules.scheduler import Scheduler
+from modules.reminder_store import ReminderStore
+from modules.recurrence import parse_recurrence, next_occurrence
+from modules.time_parser import parse_time
 
 class ReminderModule(QObject):
     reminder_triggered = pyqtSignal(str, str)  # name, message
 
-    def __init__(self):
+    def __init__(self, speak: Optional[Callable[[str], None]] = None):
         super().__init__()
-        self.reminders: List[Dict] = []
-        self.active_reminders: Dict[str, List[threading.Timer]] = {}  # name: [main_timer, pre_timer]
-        self.speaker = pyttsx3.init()
+        self.reminders = ReminderStore()
+        # The scheduler thread and command threads both reach the store; re-entrant because
+        # adding a reminder schedules it, and scheduling a past recurring one advances it
+        self._lock = threading.RLock()
+        self.scheduler = Scheduler("reminders")  # keys: (name, 'pre') and (name, 'main')
+        self.speaker = speak  # the assistant's speak, so there is only one TTS engine
         self.load_reminders()
 
     def speak(self, text: str):
-        self.speaker.say(text)
-        self.speaker.runAndWait()
+        if self.speaker:
+            self.speaker(text)
 
-    def add_reminder(self, name: str, message: str, trigger_time: datetime) -> bool:
+    def add_reminder(self, name: str, message: str, trigger_time: datetime,
+                     recurrence: Optional[Dict] = None) -> bool:
         reminder = {
             'name': name,
             'message': message,
             'trigger_time': trigger_time.isoformat(),
             'created_at': datetime.now().isoformat()
         }
+        if recurrence:
+            reminder['recurrence'] = recurrence  # one stored rule per series
 
-        if any(r['name'].lower() == name.lower() for r in self.reminders):
-            return False  # Duplicate
+        with self._lock:
+            if not self.reminders.add(reminder):
+                return False  # Duplicate
 
-        self.reminders.append(reminder)
-        self.schedule_reminder(reminder)
-        self.save_reminders()
+            self.schedule_reminder(reminder)
+            self.save_reminders()
         return True
 
     def schedule_reminder(self, reminder: Dict):
@@ -48,29 +56,20 @@ class ReminderModule(QObject):
             now = datetime.now()
 
             if trigger_time <= now:
+                if reminder.get('recurrence'):
+                    self._advance_recurring(reminder)
+                    return
                 print(f"Reminder '{name}' is in the past. Skipping...")
                 return
 
-            # Cancel existing timers
-            if name in self.active_reminders:
-                for t in self.active_reminders[name]:
-                    t.cancel()
-
-            delay_main = (trigger_time - now).total_seconds()
-            delay_pre = delay_main - 600  # 10 minutes before
+            # Replace any existing jobs for this reminder
+            self.scheduler.cancel((name, 'pre'))
 
-            timers = []
+            pre_time = trigger_time - timedelta(minutes=10)
+            if pre_time > now:
+                self.scheduler.schedule((name, 'pre'), pre_time, self.trigger_pre_reminder, name, message)
 
-            if delay_pre > 0:
-                t_pre = threading.Timer(delay_pre, self.trigger_pre_reminder, args=[name, message])
-                t_pre.start()
-                timers.append(t_pre)
-
-            t_main = threading.Timer(delay_main, self.trigger_reminder, args=[reminder])
-            t_main.start()
-            timers.append(t_main)
-
-            self.active_reminders[name] = timers
+            self.scheduler.schedule((name, 'main'), trigger_time, self.trigger_reminder, reminder)
         except Exception as e:
             print(f"Error scheduling reminder: {e}")
 
@@ -83,43 +82,69 @@ class ReminderModule(QObject):
         name = reminder['name']
         message = reminder['message']
         print(f"Reminder now: {message}")
-        self.speak(message)
+        self.speak(f"Reminder: {message}")  # the only place a reminder is spoken
         self.reminder_triggered.emit(name, message)
-        self.remove_reminder(name)
+        if reminder.get('recurrence'):
+            self._advance_recurring(reminder)
+        else:
+            with self._lock:
+                if self.reminders.get(name) is reminder:  # not replaced while it was firing
+                    self.remove_reminder(name)
+
+    def _advance_recurring(self, reminder: Dict):
+        """Move a recurring reminder to its next occurrence and schedule only that one"""
+        with self._lock:
+            if self.reminders.get(reminder['name']) is not reminder:
+                return  # deleted or replaced while it was firing
+            next_time = next_occurrence(reminder['recurrence'], datetime.now())
+            self.reminders.remove(reminder['name'])
+            reminder['trigger_time'] = next_time.isoformat()
+            self.reminders.add(reminder)
+            self.schedule_reminder(reminder)
+            self.save_reminders()
 
     def remove_reminder(self, name: str) -> bool:
-        if name in self.active_reminders:
-            for t in self.active_reminders[name]:
-                t.cancel()
-            del self.active_reminders[name]
-
-        before = len(self.reminders)
-        self.reminders = [r for r in self.reminders if r['name'].lower() != name.lower()]
-        if len(self.reminders) < before:
+        with self._lock:
+            removed = self.reminders.remove(name)
+            if removed is None:
+                return False
+            self.scheduler.cancel((removed['name'], 'pre'))
+            self.scheduler.cancel((removed['name'], 'main'))
             self.save_reminders()
-            return True
-        return False
-
-    def remove_all_reminders(self):
-        for timers in self.active_reminders.values():
-            for t in timers:
-                t.cancel()
-        self.active_reminders.clear()
-        self.reminders.clear()
-        self.save_reminders()
-        self.speak("All reminders have been deleted.")
-        print("All reminders deleted.")
+        return True
+
+    def remove_all_reminders(self) -> int:
+        """Delete every reminder and return how many there were; announcing it is up to the caller"""
+        with self._lock:
+            count = len(self.reminders)
+            self.scheduler.clear()
+            self.reminders.clear()
+            self.save_reminders()
+        return count
 
     def get_reminders(self) -> List[Dict]:
-        now = datetime.now()
-        return [r for r in self.reminders if datetime.fromisoformat(r['trigger_time']) > now]
+        with self._lock:
+            return self.reminders.upcoming()
+
+    def upcoming(self, n: Optional[int] = None) -> List[Dict]:
+        """The next n pending reminders, soonest first"""
+        with self._lock:
+            return self.reminders.upcoming(n)
+
+    def count_upcoming(self) -> int:
+        with self._lock:
+            return self.reminders.count_upcoming()
+
+    def between(self, start: datetime, end: datetime) -> List[Dict]:
+        with self._lock:
+            return self.reminders.between(start, end)
 
     def save_reminders(self):
         reminder_file = PathConfig.DATABASE_DIR / "reminders.json"
         try:
             os.makedirs(PathConfig.DATABASE_DIR, exist_ok=True)
-            with open(reminder_file, 'w') as f:
-                json.dump(self.reminders, f, indent=2)
+            with self._lock, open(reminder_file, 'w') as f:  # so an older snapshot never overwrites a newer one
+                json.dump(self.reminders.to_list(), f, indent=2)
         except Exception as e:
             print(f"Error saving reminders: {e}")
 
@@ -128,15 +153,28 @@ class ReminderModule(QObject):
         try:
             if reminder_file.exists():
                 with open(reminder_file, 'r') as f:
-                    self.reminders = json.load(f)
-                for r in self.reminders:
-                    self.schedule_reminder(r)
+                    reminders = ReminderStore(json.load(f))
+                with self._lock:
+                    self.reminders = reminders
+                    for r in self.reminders:
+                        self.schedule_reminder(r)
         except Exception as e:
             print(f"Error loading reminders: {e}")
 
     def parse_reminder_time(self, time_str: str) -> Optional[datetime]:
-        parsed = dateparser.parse(time_str, settings={"PREFER_DATES_FROM": "future"})
-        return parsed
+        return parse_time(time_str, AssistantConfig.REMINDER_LANGUAGES)
+
+    def extract_recurring_reminder_info(self, command: str) -> Optional[tuple]:
+        """(name, message, rule) for commands like 'remind me to stand up every hour'"""
+        rule, rest = parse_recurrence(command)
+        if not rule:
+            return None
+        match = re.search(r"(?:remind me to|remind me|set a? ?reminder (?:for|about|to))\s+(.+)", rest)
+        message = (match.group(1) if match else rest).strip(" ,.")
+        if not message:
+            return None
+        name = message[:30] + "..." if len(message) > 30 else message
+        return name, message, rule
 
     def extract_reminder_info(self, command: str) -> tuple:
         command = command.lower()
@@ -0,0 +1,82 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ReminderStore:
+    """Reminders keyed by case-folded name and kept sorted by parsed trigger time.
+
+    Not thread-safe; ReminderModule holds its lock around every call.
+    """
+
+    def __init__(self, reminders: Iterable[Dict] = ()):
+        self._by_name: Dict[str, Dict] = {}
+        self._times: Dict[str, datetime] = {}
+        self._order: List[Tuple[datetime, str]] = []  # (trigger_time, key), sorted
+        for reminder in reminders:
+            try:
+                self.add(reminder)
+            except (KeyError, ValueError) as e:
+                print(f"Skipping invalid reminder {reminder!r}: {e}")
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.casefold()
+
+    def add(self, reminder: Dict) -> bool:
+        """Insert a reminder; returns False if one with the same name exists"""
+        key = self._key(reminder['name'])
+        if key in self._by_name:
+            return False
+        trigger_time = datetime.fromisoformat(reminder['trigger_time'])
+        self._by_name[key] = reminder
+        self._times[key] = trigger_time
+        insort(self._order, (trigger_time, key))
+        return True
+
+    def get(self, name: str) -> Optional[Dict]:
+        return self._by_name.get(self._key(name))
+
+    def trigger_time(self, name: str) -> Optional[datetime]:
+        return self._times.get(self._key(name))
+
+    def remove(self, name: str) -> Optional[Dict]:
+        key = self._key(name)
+        reminder = self._by_name.pop(key, None)
+        if reminder is None:
+            return None
+        entry = (self._times.pop(key), key)
+        del self._order[bisect_left(self._order, entry)]
+        return reminder
+
+    def clear(self):
+        self._by_name.clear()
+        self._times.clear()
+        self._order.clear()
+
+    def upcoming(self, n: Optional[int] = None, after: Optional[datetime] = None) -> List[Dict]:
+        """The next n reminders due after `after` (default: now), soonest first"""
+        start = bisect_right(self._order, after or datetime.now(), key=lambda entry: entry[0])
+        end = len(self._order) if n is None else min(len(self._order), start + n)
+        return [self._by_name[key] for _, key in self._order[start:end]]
+
+    def count_upcoming(self, after: Optional[datetime] = None) -> int:
+        return len(self._order) - bisect_right(self._order, after or datetime.now(), key=lambda entry: entry[0])
+
+    def between(self, start: datetime, end: datetime) -> List[Dict]:
+        """Reminders with start <= trigger_time < end, soonest first"""
+        lo = bisect_left(self._order, start, key=lambda entry: entry[0])
+        hi = bisect_left(self._order, end, key=lambda entry: entry[0])
+        return [self._by_name[key] for _, key in self._order[lo:hi]]
+
+    def to_list(self) -> List[Dict]:
+        return [self._by_name[key] for _, key in self._order]
+
+    def __contains__(self, name: str) -> bool:
+        return self._key(name) in self._by_name
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_list())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
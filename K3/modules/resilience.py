@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Optional
+from config import ResilienceConfig
+
+_executor = ThreadPoolExecutor(max_workers=ResilienceConfig.HEDGE_WORKERS, thread_name_prefix="upstream")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+
+def command_budget(command_type: str) -> float:
+    """Seconds a command of this type may take end to end"""
+    return ResilienceConfig.COMMAND_BUDGETS.get(command_type, ResilienceConfig.DEFAULT_BUDGET)
+
+
+def upstream_timeout(command_type: str) -> float:
+    """Timeout for the upstream call made on behalf of a command, leaving room for the rest of it"""
+    return command_budget(command_type) * ResilienceConfig.UPSTREAM_BUDGET_SHARE
+
+
+def is_client_error(error: BaseException) -> bool:
+    """True for a 4xx response other than a timeout or rate limit: the request was at fault, not the service"""
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in (408, 429)
+
+
+class LatencyTracker:
+    def __init__(self, size: int = 100):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < ResilienceConfig.HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one trial call through after reset_timeout.
+
+    A trial that never reports back (its caller was cancelled) is given up on after
+    another reset_timeout, so the breaker cannot stay half open for good.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if ((self.state == "open" and now - self._opened_at >= self.reset_timeout)
+                    or (self.state == "half_open" and now - self._trial_at >= self.reset_timeout)):
+                self.state = "half_open"  # this caller is the trial
+                self._trial_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """The call was abandoned before it succeeded or failed; let the next caller make the trial"""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+                self._opened_at = time.monotonic() - self.reset_timeout
+
+
+class Upstream:
+    """Timeouts, hedged retries and a circuit breaker around calls to one external service.
+
+    An attempt is a callable taking the seconds it may use. When hedging is on and the
+    first attempt outlives the service's recent p95 latency, a second attempt is started
+    and whichever finishes first wins.
+    """
+
+    def __init__(self, name: str, hedge: bool = True):
+        self.name = name
+        self.hedge = hedge
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(ResilienceConfig.BREAKER_FAILURE_THRESHOLD,
+                                      ResilienceConfig.BREAKER_RESET_TIMEOUT)
+        self.hedges = 0
+        self.fast_failures = 0
+
+    def _hedge_delay(self, timeout: float) -> Optional[float]:
+        if not self.hedge:
+            return None
+        threshold = self.latency.percentile(ResilienceConfig.HEDGE_PERCENTILE)
+        if threshold is None or threshold >= timeout:
+            return None
+        return threshold
+
+    def check(self):
+        """Raise CircuitOpenError if calls to this upstream are currently being skipped"""
+        if not self.breaker.allow():
+            self.fast_failures += 1
+            raise CircuitOpenError(f"{self.name} is unavailable")
+
+    def _succeeded(self, started: float):
+        self.latency.record(time.monotonic() - started)
+        self.breaker.record_success()
+
+    def record_error(self, error: BaseException):
+        """Count a failed call against the breaker, unless the service answered and only rejected the request"""
+        if is_client_error(error):
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def call(self, attempt: Callable[[float], Any], timeout: float) -> Any:
+        self.check()
+        started = time.monotonic()
+        deadline = started + timeout
+        pending = {_executor.submit(attempt, timeout)}
+        hedge_delay = self._hedge_delay(timeout)
+        if hedge_delay is not None:
+            done, _ = wait(pending, timeout=hedge_delay)
+            if not done:
+                self.hedges += 1
+                pending.add(_executor.submit(attempt, deadline - time.monotonic()))
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                error = TimeoutError(f"{self.name} took longer than {timeout:.1f}s")
+                break
+            for future in done:
+                if future.exception() is None:
+                    self._succeeded(started)
+                    return future.result()
+                error = future.exception()
+        self.record_error(error)
+        raise error
+
+    async def call_async(self, attempt: Callable[[float], Awaitable[Any]], timeout: float) -> Any:
+        self.check()
+        started = time.monotonic()
+        deadline = started + timeout
+        pending = {asyncio.ensure_future(attempt(timeout))}
+        hedge_delay = self._hedge_delay(timeout)
+        error = None
+        try:
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done:
+                    self.hedges += 1
+                    pending.add(asyncio.ensure_future(attempt(deadline - time.monotonic())))
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    error = TimeoutError(f"{self.name} took longer than {timeout:.1f}s")
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        self._succeeded(started)
+                        return task.result()
+                    error = task.exception()
+        except asyncio.CancelledError:
+            self.breaker.release()  # e.g. the command's wait_for ran out first
+            raise
+        finally:
+            for task in pending:
+                task.cancel()
+        self.record_error(error)
+        raise error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.breaker.state,
+            'p95_latency': self.latency.percentile(95),
+            'hedges': self.hedges,
+            'fast_failures': self.fast_failures
+        }
@@ -0,0 +1,158 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Persistent LRU cache of chat responses keyed by normalised prompt, model and temperature bucket.
+
+    Changes are written to disk by a timer thread save_delay seconds after the first
+    one, so a burst of puts costs one write and callers on the event loop never wait
+    for the disk. Anything still unsaved is written at exit.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 500, max_age: float = 7 * 24 * 3600,
+                 save_delay: float = 2.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.save_delay = save_delay
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one writer at a time, so an older snapshot never lands last
+        self._save_timer: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_latency = 0.0  # seconds of upstream time avoided by hits
+        self._load()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def normalise(prompt: str) -> str:
+        return re.sub(r"\s+", " ", prompt.strip().lower()).rstrip("?!. ")
+
+    @staticmethod
+    def temperature_bucket(temperature: float) -> float:
+        return round(temperature, 1)
+
+    def _key(self, prompt: str, model: str, temperature: float) -> str:
+        raw = f"{model}|{self.temperature_bucket(temperature)}|{self.normalise(prompt)}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, prompt: str, model: str, temperature: float) -> Optional[str]:
+        key = self._key(prompt, model, temperature)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry['created_at'] > self.max_age:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_latency += entry['latency']
+            return entry['response']
+
+    def put(self, prompt: str, model: str, temperature: float, response: str, latency: float):
+        key = self._key(prompt, model, temperature)
+        with self._lock:
+            self._entries[key] = {
+                'prompt': self.normalise(prompt),
+                'model': model,
+                'temperature': self.temperature_bucket(temperature),
+                'response': response,
+                'latency': latency,
+                'created_at': time.time()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._schedule_save()
+
+    def invalidate(self, prompt: str, model: Optional[str] = None, temperature: Optional[float] = None) -> int:
+        """Drop cached answers for a prompt (every model/temperature unless given); returns how many"""
+        normalised = self.normalise(prompt)
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if entry['prompt'] == normalised
+                    and (model is None or entry['model'] == model)
+                    and (temperature is None or entry['temperature'] == self.temperature_bucket(temperature))]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            self._schedule_save()
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._schedule_save()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saved_latency': self.saved_latency
+            }
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            now = time.time()
+            # Stored oldest-used first, so the LRU order survives a restart
+            for key, entry in entries.items():
+                if now - entry['created_at'] <= self.max_age:
+                    self._entries[key] = entry
+        except Exception as e:
+            print(f"Error loading chat cache: {e}")
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                return  # the pending save will include this change
+            self._save_timer = threading.Timer(self.save_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write pending changes now instead of waiting for the timer"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self.save()
+
+    def save(self):
+        with self._save_lock:
+            with self._lock:
+                self._save_timer = None
+                payload = json.dumps(self._entries)
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Error saving chat cache: {e}")
+                if tmp_path is not None:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
@@ -0,0 +1,84 @@
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+
+class Scheduler:
+    """Runs callbacks at wall-clock times from a single thread, ordered by a heap"""
+    MAX_WAIT = 60  # seconds; re-check the clock at least this often
+
+    def __init__(self, name: str = "scheduler"):
+        self.name = name
+        self._heap: List[Tuple[float, int, Hashable]] = []  # (due timestamp, seq, key)
+        self._jobs: Dict[Hashable, Tuple[int, Callable, tuple]] = {}  # key: (seq, callback, args)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, key: Hashable, when: datetime, callback: Callable, *args: Any):
+        """Run callback(*args) at `when`, replacing any job already under key"""
+        with self._cond:
+            seq = next(self._seq)
+            self._jobs[key] = (seq, callback, args)
+            heapq.heappush(self._heap, (when.timestamp(), seq, key))
+            self._compact_heap()
+            self._ensure_thread()
+            self._cond.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a pending job; its heap entry is dropped lazily when it surfaces"""
+        with self._cond:
+            return self._jobs.pop(key, None) is not None
+
+    def clear(self):
+        with self._cond:
+            self._jobs.clear()
+            self._heap.clear()
+            self._cond.notify()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _compact_heap(self):
+        # Keep cancelled/replaced entries from piling up in the heap
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._jobs):
+            self._heap = [entry for entry in self._heap
+                          if entry[2] in self._jobs and self._jobs[entry[2]][0] == entry[1]]
+            heapq.heapify(self._heap)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    due, seq, key = self._heap[0]
+                    current = self._jobs.get(key)
+                    if current is None or current[0] != seq:
+                        heapq.heappop(self._heap)  # cancelled or rescheduled
+                        continue
+                    delay = due - time.time()
+                    if delay > 0:
+                        self._cond.wait(min(delay, self.MAX_WAIT))
+                        continue
+                    heapq.heappop(self._heap)
+                    del self._jobs[key]
+                    job = current
+            _, callback, args = job
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Scheduled job {key!r} failed: {e}")
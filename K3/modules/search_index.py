@@ -0,0 +1,141 @@
+import heapq
+import math
+import os
+import pickle
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i i'm in is it it's me my
+of on or so that the this to was what when where which who why will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class HistoryIndex:
+    """Incrementally maintained inverted index over chat messages with BM25 ranking"""
+    K1 = 1.5
+    B = 0.75
+    SAVE_EVERY = 200  # minimum additions between background saves
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one save at a time, so an older snapshot never lands last
+        self._copied_terms = None  # while a save is pickling: terms whose posting dict add() has replaced
+        self._saving = False
+        self._unsaved = 0
+        self.postings: Dict[str, Dict[int, int]] = {}  # term: {doc_id: term frequency}
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        self.last_doc_id = -1
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+            self.postings = state['postings']
+            self.doc_lengths = state['doc_lengths']
+            self.total_length = state['total_length']
+            self.last_doc_id = state['last_doc_id']
+        except Exception as e:
+            print(f"Search index unreadable, rebuilding: {e}")
+            self.clear()
+
+    def save(self):
+        with self._save_lock:
+            # Only the outer dicts are copied under the lock. The posting dicts are shared
+            # with the snapshot, and add() copies one before changing it while a save runs.
+            with self._lock:
+                state = {
+                    'postings': dict(self.postings),
+                    'doc_lengths': dict(self.doc_lengths),
+                    'total_length': self.total_length,
+                    'last_doc_id': self.last_doc_id
+                }
+                self._unsaved = 0
+                self._copied_terms = set()
+            try:
+                payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+            finally:
+                with self._lock:
+                    self._copied_terms = None
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+
+    def _save_in_background(self):
+        try:
+            self.save()
+        except Exception as e:
+            print(f"Error saving search index: {e}")
+        finally:
+            self._saving = False
+
+    def add(self, doc_id: int, text: str):
+        terms = Counter(tokenize(text))
+        with self._lock:
+            copied = self._copied_terms
+            for term, tf in terms.items():
+                docs = self.postings.get(term)
+                if docs is None:
+                    docs = self.postings[term] = {}
+                elif copied is not None and term not in copied:
+                    docs = self.postings[term] = dict(docs)  # the one being pickled stays as it was
+                    copied.add(term)
+                docs[doc_id] = tf
+            length = sum(terms.values())
+            self.doc_lengths[doc_id] = length
+            self.total_length += length
+            self.last_doc_id = max(self.last_doc_id, doc_id)
+            self._unsaved += 1
+            # Scale the save interval with the index so persistence stays amortised O(1) per add
+            threshold = max(self.SAVE_EVERY, len(self.doc_lengths) // 10)
+            start_save = self._unsaved >= threshold and not self._saving
+            if start_save:
+                self._saving = True
+        if start_save:
+            threading.Thread(target=self._save_in_background, daemon=True).start()
+
+    def add_many(self, docs: Iterable[Tuple[int, str]]):
+        for doc_id, text in docs:
+            self.add(doc_id, text)
+
+    def clear(self):
+        with self._lock:
+            self.postings = {}
+            self.doc_lengths = {}
+            self.total_length = 0
+            self.last_doc_id = -1
+            self._unsaved += 1
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """Top-k (doc_id, score) pairs, best first"""
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self.doc_lengths)
+            if not terms or not n_docs:
+                return []
+            avg_length = self.total_length / n_docs
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
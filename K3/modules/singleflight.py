@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapses concurrent identical calls into one: the first caller runs it, the rest wait for its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[tuple, _AsyncCall] = {}  # (event loop, key): call
+        self.upstream_calls = 0
+        self.shared_calls = 0  # callers served by someone else's in-flight call
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.upstream_calls += 1
+            else:
+                self.shared_calls += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Like do, for coroutines. The call runs as its own task, so the caller that started it
+        can be cancelled without taking the others down; it is cancelled once nobody awaits it."""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            call = self._async_calls.get(flight_key)
+            if call is None:
+                call = self._async_calls[flight_key] = _AsyncCall(loop.create_task(fn()))
+                call.task.add_done_callback(lambda task: self._finished(flight_key, call))
+                self.upstream_calls += 1
+            else:
+                self.shared_calls += 1
+            call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.task.done()
+            if abandoned:
+                call.task.cancel()
+
+    def _finished(self, flight_key: tuple, call: "_AsyncCall"):
+        with self._lock:
+            if self._async_calls.get(flight_key) is call:
+                del self._async_calls[flight_key]
+        if not call.task.cancelled():
+            call.task.exception()  # mark retrieved in case every caller had gone
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'upstream_calls': self.upstream_calls, 'shared_calls': self.shared_calls}
@@ -0,0 +1,338 @@
+import heapq
+import io
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from config import SpeechConfig
+from modules.audio_cache import AudioCache
+
+# Lower numbers are spoken first; within a priority, utterances keep their order
+PRIORITY_REMINDER = 0
+PRIORITY_RESPONSE = 10
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\s*\n+\s*")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences and lines of text, with short fragments such as "1." joined to what follows"""
+    sentences, pending = [], ""
+    for part in _SENTENCE_RE.split(text.strip()):
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= SpeechConfig.MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        sentences.append(pending)
+    return sentences
+
+
+class SpeechHandle:
+    """One speak() request; wait() blocks until it has been spoken, cancel() drops what is left of it"""
+
+    def __init__(self, text: str, priority: int = PRIORITY_RESPONSE, key: Optional[Hashable] = None,
+                 service: Optional["SpeechService"] = None):
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.cancelled = False
+        self._service = service
+        self._remaining = 0
+        self._done = threading.Event()
+
+    @classmethod
+    def skipped(cls, text: str) -> "SpeechHandle":
+        """A handle for text that will not be spoken, e.g. while voice is disabled"""
+        handle = cls(text)
+        handle._done.set()
+        return handle
+
+    def cancel(self):
+        """Skip the sentences not yet played; a sentence already playing is finished, and done only then"""
+        self.cancelled = True
+        if self._service is not None:
+            self._service._drop(self)
+        else:
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class SpeechService:
+    """The single owner of speech output.
+
+    Text is split into sentences and queued by priority. One thread synthesises
+    sentences up to PIPELINE_DEPTH ahead of a second thread that plays them, so the
+    next sentence is ready when the current one ends. A more urgent utterance (a
+    reminder) jumps ahead of queued sentences at the next sentence boundary.
+    """
+
+    def __init__(self, backend, on_state: Optional[Callable[[bool], None]] = None):
+        self.backend = backend
+        self.on_state = on_state  # called with True when speech starts and False when the queue drains
+        self.available = True
+        self._pending = []  # heap of (priority, seq, handle, sentence) awaiting synthesis
+        self._ready = []  # heap of (priority, seq, handle, audio) awaiting playback
+        self._keys: Dict[Hashable, SpeechHandle] = {}
+        self._outstanding = 0  # sentences queued and not yet played or skipped
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        threading.Thread(target=self._synthesise_loop, name="speech-synth", daemon=True).start()
+        threading.Thread(target=self._playback_loop, name="speech", daemon=True).start()
+
+    def speak(self, text: str, priority: int = PRIORITY_RESPONSE, key: Optional[Hashable] = None) -> SpeechHandle:
+        """Queue text and return at once. With a key, an unfinished utterance under the same key is cancelled."""
+        if not self.available:
+            return SpeechHandle.skipped(text)
+        handle = SpeechHandle(text, priority, key, service=self)
+        sentences = split_sentences(text)
+        with self._cond:
+            if key is not None:
+                previous = self._keys.get(key)
+                if previous is not None:
+                    previous.cancel()
+                self._keys[key] = handle
+            handle._remaining = len(sentences)
+            if not sentences:
+                handle._done.set()
+            for sentence in sentences:
+                heapq.heappush(self._pending, (priority, next(self._seq), handle, sentence))
+            self._outstanding += len(sentences)
+            self._cond.notify_all()
+        return handle
+
+    def cancel_all(self):
+        with self._cond:
+            handles = {id(entry[2]): entry[2] for entry in self._pending + self._ready}
+        for handle in handles.values():
+            handle.cancel()
+
+    def _drop(self, handle: SpeechHandle):
+        """Remove a cancelled handle's queued sentences; it is done once none of it is synthesising or playing"""
+        with self._cond:
+            dropped_audio = [entry[3] for entry in self._ready if entry[2] is handle and entry[3] is not None]
+            before = len(self._pending) + len(self._ready)
+            self._pending = [entry for entry in self._pending if entry[2] is not handle]
+            self._ready = [entry for entry in self._ready if entry[2] is not handle]
+            heapq.heapify(self._pending)
+            heapq.heapify(self._ready)
+            dropped = before - len(self._pending) - len(self._ready)
+            self._outstanding -= dropped
+            handle._remaining -= dropped
+            if handle._remaining <= 0:
+                self._finished(handle)
+            self._cond.notify_all()
+        for audio in dropped_audio:
+            self.backend.release(audio)
+
+    def _finished(self, handle: SpeechHandle):
+        """Caller holds the lock"""
+        handle._done.set()
+        if self._keys.get(handle.key) is handle:
+            del self._keys[handle.key]
+
+    def prerender(self, texts: Iterable[str]):
+        """Synthesise texts ahead of time, for backends that keep what they synthesise"""
+        if hasattr(self.backend, 'prerender'):
+            self.backend.prerender([sentence for text in texts for sentence in split_sentences(text)])
+
+    @property
+    def busy(self) -> bool:
+        return self._outstanding > 0
+
+    def _synthesise_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending or len(self._ready) >= SpeechConfig.PIPELINE_DEPTH:
+                    self._cond.wait()
+                priority, seq, handle, sentence = heapq.heappop(self._pending)
+            audio = None
+            if not handle.cancelled and self.available:
+                try:
+                    audio = self.backend.synthesize(sentence)
+                except Exception as e:
+                    print(f"Speech error: {e}")
+            with self._cond:
+                heapq.heappush(self._ready, (priority, seq, handle, audio))
+                self._cond.notify_all()
+
+    def _playback_loop(self):
+        # Engines such as pyttsx3 must be used from the thread that created them
+        try:
+            self.backend.open()
+        except Exception as e:
+            print(f"Voice setup error: {e}")
+            self.available = False
+        speaking = False
+        while True:
+            with self._cond:
+                # Also wake when cancellation empties the queue while speech is under way
+                while not self._ready and not (speaking and self._outstanding == 0):
+                    self._cond.wait()
+                if not self._ready:
+                    speaking = False
+                    drained = True
+                else:
+                    drained = False
+                    _, _, handle, audio = heapq.heappop(self._ready)
+                    self._cond.notify_all()  # a pipeline slot is free
+            if drained:
+                self._set_state(False)
+                continue
+            try:
+                if audio is not None and not handle.cancelled:
+                    if not speaking:
+                        speaking = True
+                        self._set_state(True)
+                    self.backend.play(audio)
+            except Exception as e:
+                print(f"Speech error: {e}")
+            finally:
+                if audio is not None:
+                    self.backend.release(audio)
+            with self._cond:
+                self._outstanding -= 1
+                handle._remaining -= 1
+                if handle._remaining <= 0:
+                    self._finished(handle)
+                idle = self._outstanding == 0
+            if idle and speaking:
+                speaking = False
+                self._set_state(False)
+
+    def _set_state(self, speaking: bool):
+        if self.on_state:
+            try:
+                self.on_state(speaking)
+            except Exception as e:
+                print(f"Speech state callback failed: {e}")
+
+
+class Pyttsx3Backend:
+    """Offline TTS. pyttsx3 synthesises while it plays, so all of its work happens at playback."""
+
+    def __init__(self, rate: int = 150):
+        self.rate = rate
+        self.engine = None
+
+    def open(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        voices = self.engine.getProperty('voices')
+        self.engine.setProperty('voice', voices[0].id)
+        self.engine.setProperty('rate', self.rate)
+
+    def synthesize(self, text: str) -> Any:
+        return text
+
+    def play(self, text: Any):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def release(self, audio: Any):
+        pass
+
+
+class GTTSBackend:
+    """Google TTS. Each sentence is synthesised once and then served from the audio cache;
+    the pipeline overlaps the network round trip for a new sentence with playback."""
+
+    def __init__(self, lang: str = SpeechConfig.GTTS_LANG, tld: str = SpeechConfig.GTTS_TLD,
+                 cache: Optional[AudioCache] = None):
+        self.lang = lang
+        self.tld = tld
+        self.cache = cache
+        self.player = None
+
+    def open(self):
+        self.player = open_player()
+
+    def _render(self, text: str) -> bytes:
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=self.lang, tld=self.tld).write_to_fp(buffer)
+        return buffer.getvalue()
+
+    def synthesize(self, text: str) -> str:
+        if self.cache is None:
+            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+                f.write(self._render(text))
+            return f.name
+        path = self.cache.get(text, self.lang, self.tld)
+        if path is None:
+            path = self.cache.put(text, self.lang, self.tld, self._render(text))
+        return str(path)
+
+    def prerender(self, sentences: List[str]):
+        if self.cache is None:
+            return
+        for sentence in sentences:
+            if self.cache.key(sentence, self.lang, self.tld) in self.cache:
+                continue
+            try:
+                self.cache.put(sentence, self.lang, self.tld, self._render(sentence))
+            except Exception as e:
+                print(f"Pre-rendering speech failed: {e}")
+                return  # most likely offline; the rest would fail too
+
+    def play(self, path: str):
+        self.player.play(path)
+
+    def release(self, path: str):
+        if self.cache is None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class PygamePlayer:
+    """Plays audio files in-process through pygame's mixer"""
+
+    def __init__(self):
+        import pygame
+        pygame.mixer.init()
+        self.music = pygame.mixer.music
+
+    def play(self, path: str):
+        self.music.load(path)
+        self.music.play()
+        while self.music.get_busy():
+            time.sleep(0.02)
+
+
+class ProcessPlayer:
+    """Plays audio files with the first command-line player found, started without a shell"""
+    COMMANDS = (["mpg123", "-q"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"], ["afplay"])
+
+    def __init__(self):
+        self.command = next((command for command in self.COMMANDS if shutil.which(command[0])), None)
+        if self.command is None and os.name != 'nt':
+            raise RuntimeError("No audio player found; install pygame or mpg123")
+
+    def play(self, path: str):
+        if self.command is not None:
+            subprocess.run(self.command + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:  # Windows without a command-line player
+            os.startfile(path)
+            time.sleep(1)  # startfile returns before playback ends
+
+
+def open_player():
+    """pygame when it is installed, otherwise a command-line player"""
+    try:
+        return PygamePlayer()
+    except Exception:
+        return ProcessPlayer()
@@ -0,0 +1,254 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from config import PathConfig
+from modules.search_index import HistoryIndex
+from modules.json_state import default_user_data, load_json_state
+
+
+# user_data.json keys kept as rows of the settings table
+_SETTINGS_KEYS = ('user_preferences', 'system_settings', 'conversation_summary')
+
+
+def _timestamp(value: Union[str, datetime]) -> str:
+    return str(value) if isinstance(value, datetime) else value
+
+
+def _create_schema(conn: sqlite3.Connection):
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS chat_history (
+            id INTEGER PRIMARY KEY,
+            sender TEXT NOT NULL,
+            message TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_chat_timestamp ON chat_history (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_chat_sender_timestamp ON chat_history (sender, timestamp);
+    """)
+
+
+def _import_state(conn: sqlite3.Connection, data: Dict) -> int:
+    """Copy settings and chat history from loaded user_data.json in one transaction; returns messages copied"""
+    history = data.get('chat_history', [])
+    conn.execute("BEGIN")
+    try:
+        for key in _SETTINGS_KEYS:
+            if key in data:
+                conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                             (key, json.dumps(data[key])))
+        conn.executemany("INSERT INTO chat_history (sender, message, timestamp) VALUES (?, ?, ?)",
+                         ((m['sender'], m['message'], m['timestamp']) for m in history))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return len(history)
+
+
+def build_from_json(target: Path, file_path: Optional[Path] = None, journal_path: Optional[Path] = None) -> int:
+    """Create the SQLite database at target from user_data.json and its journal; returns messages copied.
+
+    The database is built under a temporary name and renamed to target only when complete,
+    so an interrupted migration never leaves a partial database that would be taken as done.
+    """
+    data = load_json_state(file_path or PathConfig.USER_DATA_FILE, journal_path or PathConfig.USER_DATA_JOURNAL)
+    temp_path = target.with_name(target.name + ".migrating")
+    for path in (temp_path, temp_path.with_name(temp_path.name + "-journal")):
+        path.unlink(missing_ok=True)  # left by an earlier attempt
+    conn = sqlite3.connect(str(temp_path), isolation_level=None)
+    try:
+        _create_schema(conn)
+        count = _import_state(conn, data)
+    except BaseException:
+        conn.close()
+        temp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(temp_path, target)
+    return count
+
+
+class SQLiteDatabase:
+    """Same interface as JSONDatabase, but chat history stays on disk and is queried by index"""
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.file_path = PathConfig.USER_DATA_SQLITE
+        if not self.file_path.exists() and PathConfig.USER_DATA_FILE.exists():
+            build_from_json(self.file_path)
+        is_new = not self.file_path.exists()
+        self._write_lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.file_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        _create_schema(self._conn)
+        if is_new:
+            self._seed_defaults()
+        # Preferences and settings are small, so they are kept in memory
+        self._settings = {key: json.loads(value) for key, value in
+                          self._conn.execute("SELECT key, value FROM settings")}
+        self.search_index = HistoryIndex(self.file_path.with_name(self.file_path.name + ".index"))
+        self._sync_search_index()
+        atexit.register(self.search_index.save)
+
+    def _sync_search_index(self):
+        """Index whatever was added since the index was last saved"""
+        max_id = self._conn.execute("SELECT COALESCE(MAX(id), -1) FROM chat_history").fetchone()[0]
+        if self.search_index.last_doc_id > max_id:
+            self.search_index.clear()
+        self.search_index.add_many(self._conn.execute(
+            "SELECT id, message FROM chat_history WHERE id > ? ORDER BY id",
+            (self.search_index.last_doc_id,)))
+
+    def _seed_defaults(self):
+        data = default_user_data()
+        with self._write_lock:
+            for key in ('user_preferences', 'system_settings'):
+                self._set(key, data[key])
+
+    def migrate_from_json(self, file_path: Optional[Path] = None, journal_path: Optional[Path] = None) -> int:
+        """Import user_data.json (and its journal) into this database and return the number of messages copied"""
+        data = load_json_state(file_path or PathConfig.USER_DATA_FILE,
+                               journal_path or PathConfig.USER_DATA_JOURNAL)
+        with self._write_lock:
+            count = _import_state(self._conn, data)
+            self._settings.update({k: data[k] for k in _SETTINGS_KEYS if k in data})
+        return count
+
+    def _set(self, key: str, value):
+        with self._write_lock:
+            self._conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                               (key, json.dumps(value)))
+
+    def _rows_to_messages(self, rows) -> List[Dict]:
+        return [{'sender': sender, 'message': message, 'timestamp': timestamp}
+                for sender, message, timestamp in rows]
+
+    def save(self):
+        """Every write is already committed; kept for JSONDatabase compatibility"""
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def get_user_preferences(self):
+        return self._settings.get('user_preferences', {})
+
+    def update_user_preferences(self, preferences):
+        self._settings['user_preferences'] = preferences
+        self._set('user_preferences', preferences)
+
+    def get_chat_history(self, limit: Optional[int] = None,
+                         before: Union[str, datetime, None] = None) -> List[Dict]:
+        """Chat messages in chronological order, optionally the last `limit` older than `before`"""
+        query = "SELECT sender, message, timestamp FROM chat_history"
+        params = []
+        if before is not None:
+            query += " WHERE timestamp < ?"
+            params.append(_timestamp(before))
+        query += " ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self._conn.execute(query, params).fetchall()
+        rows.reverse()
+        return self._rows_to_messages(rows)
+
+    def count_chat_messages(self, sender: Optional[str] = None) -> int:
+        if sender is None:
+            return self._conn.execute("SELECT COUNT(*) FROM chat_history").fetchone()[0]
+        return self._conn.execute("SELECT COUNT(*) FROM chat_history WHERE sender = ?",
+                                  (sender,)).fetchone()[0]
+
+    def get_chat_history_between(self, start: Union[str, datetime],
+                                 end: Union[str, datetime]) -> List[Dict]:
+        """Chat messages with start <= timestamp < end"""
+        rows = self._conn.execute(
+            "SELECT sender, message, timestamp FROM chat_history "
+            "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp, id",
+            (_timestamp(start), _timestamp(end))).fetchall()
+        return self._rows_to_messages(rows)
+
+    def add_chat_message(self, sender, message):
+        with self._write_lock:
+            cursor = self._conn.execute("INSERT INTO chat_history (sender, message, timestamp) VALUES (?, ?, ?)",
+                                        (sender, message, str(datetime.now())))
+            self.search_index.add(cursor.lastrowid, message)
+
+    def add_chat_messages(self, messages: Iterable[Tuple[str, str]]):
+        """Append (sender, message) pairs in order within a single transaction"""
+        now = datetime.now()
+        rows = [(sender, message, str(now + timedelta(microseconds=i)))
+                for i, (sender, message) in enumerate(messages)]
+        if not rows:
+            return
+        with self._write_lock:
+            self._conn.execute("BEGIN")
+            try:
+                ids = [self._conn.execute("INSERT INTO chat_history (sender, message, timestamp) VALUES (?, ?, ?)",
+                                          row).lastrowid for row in rows]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.search_index.add_many((doc_id, row[1]) for doc_id, row in zip(ids, rows))
+
+    def get_conversation_summary(self) -> Dict:
+        return self._settings.get('conversation_summary', {})
+
+    def set_conversation_summary(self, summary: str, upto: str):
+        value = {'summary': summary, 'upto': upto}
+        self._settings['conversation_summary'] = value
+        self._set('conversation_summary', value)
+
+    def search_history(self, query: str, k: int = 5) -> List[Dict]:
+        """Best matching chat messages for query, each with a BM25 'score'"""
+        results = self.search_index.search(query, k)
+        if not results:
+            return []
+        placeholders = ",".join("?" * len(results))
+        rows = {row[0]: row[1:] for row in self._conn.execute(
+            f"SELECT id, sender, message, timestamp FROM chat_history WHERE id IN ({placeholders})",
+            [doc_id for doc_id, _ in results])}
+        return [{'sender': rows[doc_id][0], 'message': rows[doc_id][1],
+                 'timestamp': rows[doc_id][2], 'score': score}
+                for doc_id, score in results if doc_id in rows]
+
+    def clear_chat_history(self):
+        with self._write_lock:
+            self._conn.execute("DELETE FROM chat_history")
+            self._conn.execute("DELETE FROM settings WHERE key = 'conversation_summary'")
+            self._settings.pop('conversation_summary', None)
+            self.search_index.clear()
+        self.search_index.save()
+
+    def get_system_settings(self):
+        return self._settings.get('system_settings', {})
+
+    def update_system_settings(self, settings):
+        self._settings['system_settings'] = settings
+        self._set('system_settings', settings)
+
+
+if __name__ == '__main__':
+    # python -m modules.sqlite_db  -> copy user_data.json into a fresh SQLite database
+    if PathConfig.USER_DATA_SQLITE.exists():
+        print(f"{PathConfig.USER_DATA_SQLITE} already exists; remove it to migrate again.")
+    else:
+        count = build_from_json(PathConfig.USER_DATA_SQLITE)
+        print(f"Migrated {count} messages to {PathConfig.USER_DATA_SQLITE}")
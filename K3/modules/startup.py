@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Callable, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """Collects import and initialiser timings for `main.py --profile-startup`"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self.imports: List[Tuple[str, float, float]] = []  # (module, self seconds, total seconds)
+        self.initialisers: List[Tuple[str, float, str]] = []  # (name, seconds, thread name)
+        self.marks: List[Tuple[str, float]] = []  # (event, seconds since start)
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Start recording; imports are only timed from here on"""
+        if not self.enabled:
+            self.enabled = True
+            sys.meta_path.insert(0, _TimingFinder(self))
+
+    @contextmanager
+    def timed(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                with self._lock:
+                    self.initialisers.append((name, time.perf_counter() - started,
+                                              threading.current_thread().name))
+
+    def mark(self, event: str):
+        if self.enabled:
+            with self._lock:
+                self.marks.append((event, time.perf_counter() - self.started))
+
+    def report(self, top: int = 25) -> str:
+        with self._lock:
+            imports = sorted(self.imports, key=lambda entry: entry[1], reverse=True)[:top]
+            initialisers = list(self.initialisers)
+            marks = list(self.marks)
+        lines = [f"Slowest imports (self / cumulative ms, top {len(imports)}):"]
+        lines += [f"  {own * 1000:8.1f} {total * 1000:8.1f}  {name}" for name, own, total in imports]
+        lines.append("Initialisers (ms, thread):")
+        lines += [f"  {seconds * 1000:8.1f}  {name} [{thread}]" for name, seconds, thread in initialisers]
+        lines.append("Milestones (ms since start):")
+        lines += [f"  {seconds * 1000:8.1f}  {event}" for event, seconds in marks]
+        return "\n".join(lines)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Wraps each module's loader so executing it is timed, nested imports included"""
+
+    def __init__(self, profiler: StartupProfiler):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        loader = spec.loader
+        # Builtin and frozen modules are loaded by classes shared across modules; leave those alone
+        if loader is None or isinstance(loader, type) or not hasattr(loader, 'exec_module'):
+            return spec
+        exec_module = loader.exec_module
+        stack = self._local.__dict__.setdefault('stack', [])
+        profiler = self.profiler
+
+        def timed_exec_module(module):
+            started = time.perf_counter()
+            stack.append(0.0)
+            try:
+                exec_module(module)
+            finally:
+                children = stack.pop()
+                total = time.perf_counter() - started
+                if stack:
+                    stack[-1] += total
+                with profiler._lock:
+                    profiler.imports.append((fullname, total - children, total))
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+
+class lazy_init:
+    """Like functools.cached_property, but builds the value once under a lock and records how long it took"""
+
+    def __init__(self, factory: Callable):
+        self.factory = factory
+        self.name: Optional[str] = None
+        self.lock = threading.RLock()
+        self.__doc__ = factory.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.label = f"{owner.__name__}.{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            pass
+        with self.lock:
+            if self.name not in instance.__dict__:
+                with profiler.timed(self.label):
+                    instance.__dict__[self.name] = self.factory(instance)
+            return instance.__dict__[self.name]
+
+    @staticmethod
+    def is_loaded(instance, name: str) -> bool:
+        return name in instance.__dict__
+
+
+profiler = StartupProfiler()
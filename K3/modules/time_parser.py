@@ -0,0 +1,179 @@
+import re
+import threading
+from datetime import datetime, time, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+
+# Precompiled fast path for the English time phrases reminders use most, such as
+# "3pm", "in 30 minutes", "tomorrow at 9:30" or "friday 5 pm". Anything else goes to
+# dateparser, which is imported on first use and restricted to the configured languages.
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+    "thirty": 30, "forty": 40, "forty five": 45, "fifty": 50, "sixty": 60, "ninety": 90,
+    "a couple of": 2, "a few": 3, "half an": 0.5, "half a": 0.5,
+}
+_UNITS = {
+    "s": "seconds", "sec": "seconds", "secs": "seconds", "second": "seconds", "seconds": "seconds",
+    "m": "minutes", "min": "minutes", "mins": "minutes", "minute": "minutes", "minutes": "minutes",
+    "h": "hours", "hr": "hours", "hrs": "hours", "hour": "hours", "hours": "hours",
+    "day": "days", "days": "days", "week": "weeks", "weeks": "weeks",
+}
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+# Default clock times for parts of the day, and which half of the clock they imply
+_PERIODS = {"morning": (time(9, 0), "am"), "afternoon": (time(15, 0), "pm"),
+            "evening": (time(18, 0), "pm"), "night": (time(20, 0), "pm"), "tonight": (time(20, 0), "pm")}
+
+_AMOUNT = r"(?:\d+(?:\.\d+)?|" + "|".join(sorted(map(re.escape, _NUMBER_WORDS), key=len, reverse=True)) + ")"
+_UNIT = "(?:" + "|".join(sorted(_UNITS, key=len, reverse=True)) + ")"
+_RELATIVE_RE = re.compile(
+    rf"^(?:in|after)?\s*(?P<amount>{_AMOUNT})\s*(?P<unit>{_UNIT})"
+    rf"(?:\s*(?:and|,)?\s*(?P<amount2>{_AMOUNT})\s*(?P<unit2>{_UNIT}))?"
+    rf"(?P<half>\s+and\s+a\s+half)?(?:\s+from\s+(?:now|today))?$")
+_DAY = (r"(?:the\s+)?(?P<{name}>today|tonight|tomorrow|day after tomorrow|(?:(?:this|next|on)\s+)?(?:"
+        + "|".join(_WEEKDAYS) + r"))")
+_CLOCK = (r"(?:(?P<{name}_hour>\d{{1,2}})(?::(?P<{name}_minute>\d{{2}}))?\s*(?:(?P<{name}_meridiem>am|pm)|o'?clock)?"
+          r"|(?P<{name}_word>noon|midnight))")
+_PERIOD = r"(?:(?:in\s+the\s+|this\s+)?(?P<period>morning|afternoon|evening|night))"
+_ABSOLUTE_RE = re.compile(
+    "^(?:" + _DAY.format(name="day") + r"\s*(?:,\s*)?)?"
+    + r"(?:" + _PERIOD + r"\s*)?"
+    + r"(?:(?:at|by|@)\s*)?" + _CLOCK.format(name="clock")
+    + r"(?:\s*" + _PERIOD.replace("period", "period2") + r")?"
+    + r"(?:\s*(?:,\s*)?" + _DAY.format(name="day2") + r")?$")
+_DAY_ONLY_RE = re.compile("^(?:" + _DAY.format(name="day") + r"\s*)?" + _PERIOD + "?$")
+
+
+def _amount(text: str) -> float:
+    return _NUMBER_WORDS[text] if text in _NUMBER_WORDS else float(text)
+
+
+def _normalise(text: str) -> str:
+    text = text.lower().replace("a.m.", "am").replace("p.m.", "pm")
+    return re.sub(r"\s+", " ", text).strip(" .!?")
+
+
+def _day_start(day: str, now: datetime) -> datetime:
+    """Midnight of the day a day word refers to, never in the past"""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if day in ("today", "tonight"):
+        return today
+    if day == "tomorrow":
+        return today + timedelta(days=1)
+    if day == "day after tomorrow":
+        return today + timedelta(days=2)
+    qualifier, _, name = day.rpartition(" ")
+    ahead = (_WEEKDAYS.index(name) - now.weekday()) % 7
+    if qualifier == "next" and ahead == 0:
+        ahead = 7
+    return today + timedelta(days=ahead)
+
+
+def _on_day(day: str, moment: datetime, now: datetime) -> Optional[datetime]:
+    """moment, which falls on the day named; a bare weekday already past means next week's, anything else past is None"""
+    if moment > now:
+        return moment
+    qualifier, _, name = day.rpartition(" ")
+    if name in _WEEKDAYS and qualifier != "this":
+        return moment + timedelta(days=7)
+    return None
+
+
+def _relative(match, now: datetime) -> Optional[datetime]:
+    delta = timedelta(**{_UNITS[match.group('unit')]: _amount(match.group('amount'))})
+    if match.group('amount2'):
+        delta += timedelta(**{_UNITS[match.group('unit2')]: _amount(match.group('amount2'))})
+    if match.group('half'):
+        delta += timedelta(**{_UNITS[match.group('unit2') or match.group('unit')]: 0.5})
+    return now + delta if delta > timedelta(0) else None
+
+
+def _clock(match, meridiem_hint: Optional[str]) -> Optional[Tuple[time, bool]]:
+    """(time of day, whether am/pm is settled) from the clock groups"""
+    word = match.group('clock_word')
+    if word:
+        return (time(12, 0) if word == "noon" else time(0, 0)), True
+    hour, minute = int(match.group('clock_hour')), int(match.group('clock_minute') or 0)
+    meridiem = match.group('clock_meridiem') or meridiem_hint
+    if minute > 59 or hour > 23 or (meridiem and not 1 <= hour <= 12):
+        return None
+    if meridiem == "pm" and hour < 12:
+        hour += 12
+    elif meridiem == "am" and hour == 12:
+        hour = 0
+    return time(hour, minute), bool(meridiem) or hour == 0 or hour > 12
+
+
+def _absolute(match, now: datetime) -> Optional[datetime]:
+    day = match.group('day') or match.group('day2')
+    period = match.group('period') or match.group('period2') or (day if day == "tonight" else None)
+    parsed = _clock(match, _PERIODS[period][1] if period else None)
+    if parsed is None:
+        return None
+    clock, settled = parsed
+    if day:
+        moment = datetime.combine(_day_start(day, now).date(), clock)
+        if not settled and moment <= now and clock.hour < 12:
+            moment += timedelta(hours=12)  # "today at 5" late in the morning means 5 pm
+        return _on_day(day, moment, now)
+    # A bare clock time is the next time the clock shows it
+    moment = datetime.combine(now.date(), clock)
+    candidates = [moment, moment + timedelta(hours=12)] if not settled and clock.hour < 12 else [moment]
+    for candidate in candidates:
+        if candidate > now:
+            return candidate
+    return moment + timedelta(days=1)
+
+
+def parse_time_fast(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse common English time phrases; None means the phrase needs the full parser"""
+    now = now or datetime.now()
+    text = _normalise(text)
+    match = _RELATIVE_RE.match(text)
+    if match:
+        return _relative(match, now)
+    match = _ABSOLUTE_RE.match(text)
+    if match:
+        return _absolute(match, now)
+    match = _DAY_ONLY_RE.match(text)
+    if match and text:
+        day = match.group('day') or "today"
+        period = match.group('period') or (day if day == "tonight" else None)
+        start = _day_start(day, now)
+        if period:
+            moment = datetime.combine(start.date(), _PERIODS[period][0])
+            if not match.group('day'):
+                return moment if moment > now else moment + timedelta(days=1)
+            return _on_day(day, moment, now)
+        # Same time of day on that day, as dateparser reads "tomorrow" or "friday"
+        return _on_day(day, datetime.combine(start.date(), now.time().replace(microsecond=0)), now)
+    return None
+
+
+_parsers: Dict[Tuple[str, ...], object] = {}
+_parsers_lock = threading.Lock()
+
+
+def _dateparser(languages: Sequence[str]):
+    """A DateDataParser for these languages, built once; dateparser itself is imported here"""
+    key = tuple(languages)
+    with _parsers_lock:
+        parser = _parsers.get(key)
+        if parser is None:
+            from dateparser.date import DateDataParser
+            parser = DateDataParser(languages=list(key) or None, settings={"PREFER_DATES_FROM": "future"})
+            _parsers[key] = parser
+        return parser
+
+
+def parse_time_slow(text: str, languages: Sequence[str] = ("en",)) -> Optional[datetime]:
+    data = _dateparser(languages).get_date_data(text)
+    return data.date_obj if data else None
+
+
+def parse_time(text: str, languages: Sequence[str] = ("en",), now: Optional[datetime] = None) -> Optional[datetime]:
+    """Fast path first, then dateparser limited to `languages`"""
+    parsed = parse_time_fast(text, now)
+    if parsed is not None:
+        return parsed
+    return parse_time_slow(text, languages)
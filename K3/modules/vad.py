@@ -0,0 +1,238 @@
+import queue
+import threading
+import time
+import warnings
+import wave
+from collections import deque
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+from config import VADConfig
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop  # deprecated in Python 3.11, removed in 3.13
+except ImportError:
+    audioop = None
+
+
+def frame_rms(frame: bytes, sample_width: int = 2) -> float:
+    """Root mean square of a frame of signed PCM samples, in the units speech_recognition's energy_threshold uses"""
+    if audioop is not None:
+        return audioop.rms(frame, sample_width)
+    import numpy as np
+    samples = np.frombuffer(frame, dtype={1: np.int8, 2: np.int16, 4: np.int32}[sample_width]).astype(np.float64)
+    return float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+
+
+class EnergyVAD:
+    """Cuts a stream of fixed-size PCM frames into utterances by frame energy.
+
+    A frame is voiced when its RMS is above the threshold. START_MS of consecutive voiced
+    frames open an utterance, which begins PRE_ROLL_MS before the onset thanks to a ring
+    buffer of recent frames. END_SILENCE_MS of unvoiced frames, or MAX_UTTERANCE_SECONDS,
+    close it.
+    """
+
+    def __init__(self, threshold: float, sample_width: int = 2, frame_ms: int = VADConfig.FRAME_MS):
+        self.threshold = threshold
+        self.sample_width = sample_width
+        self.frame_ms = frame_ms
+        self._start_frames = self._frames(VADConfig.START_MS)
+        self._end_frames = self._frames(VADConfig.END_SILENCE_MS)
+        self._min_frames = self._frames(VADConfig.MIN_UTTERANCE_MS)
+        self._max_frames = self._frames(VADConfig.MAX_UTTERANCE_SECONDS * 1000)
+        self._ring = deque(maxlen=self._frames(VADConfig.PRE_ROLL_MS) + self._start_frames)
+        self._utterance: Optional[List[bytes]] = None
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.last_rms = 0.0
+
+    def _frames(self, ms: float) -> int:
+        return max(1, int(round(ms / self.frame_ms)))
+
+    @property
+    def in_speech(self) -> bool:
+        return self._utterance is not None
+
+    def process(self, frame: bytes) -> Optional[bytes]:
+        """Feed one frame; returns an utterance's audio when this frame completes one"""
+        self.last_rms = frame_rms(frame, self.sample_width)
+        voiced = self.last_rms > self.threshold
+        if self._utterance is None:
+            self._ring.append(frame)
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= self._start_frames:
+                self._utterance = list(self._ring)
+                self._ring.clear()
+                self._silent_run = 0
+            return None
+        self._utterance.append(frame)
+        self._silent_run = 0 if voiced else self._silent_run + 1
+        if self._silent_run >= self._end_frames or len(self._utterance) >= self._max_frames:
+            return self._finish()
+        return None
+
+    def flush(self) -> Optional[bytes]:
+        """End the stream, returning the utterance in progress if there is one"""
+        return self._finish() if self._utterance is not None else None
+
+    def reset(self):
+        self._utterance = None
+        self._ring.clear()
+        self._voiced_run = self._silent_run = 0
+
+    def _finish(self) -> Optional[bytes]:
+        utterance, spoken = self._utterance, len(self._utterance) - self._silent_run
+        self.reset()
+        if spoken < self._min_frames:
+            return None
+        return b"".join(utterance)
+
+
+class MicrophoneSource:
+    """Frames from a speech_recognition Microphone"""
+
+    def __init__(self, microphone, frame_ms: int = VADConfig.FRAME_MS):
+        self.microphone = microphone
+        self.frame_ms = frame_ms
+
+    def __enter__(self):
+        self.microphone.__enter__()
+        self.sample_rate = self.microphone.SAMPLE_RATE
+        self.sample_width = self.microphone.SAMPLE_WIDTH
+        return self
+
+    def __exit__(self, *exc_info):
+        self.microphone.__exit__(*exc_info)
+
+    def frames(self) -> Iterator[bytes]:
+        samples = self.sample_rate * self.frame_ms // 1000
+        while True:
+            yield self.microphone.stream.read(samples)
+
+
+class WavFileSource:
+    """Frames from a mono PCM WAV file, for running the pipeline without a microphone.
+
+    With realtime=True frames are paced like live capture; otherwise they come as fast
+    as they can be read.
+    """
+
+    def __init__(self, path: Path, frame_ms: int = VADConfig.FRAME_MS, realtime: bool = False):
+        self.path = path
+        self.frame_ms = frame_ms
+        self.realtime = realtime
+        self._wav = None
+
+    def __enter__(self):
+        self._wav = wave.open(str(self.path), 'rb')
+        if self._wav.getnchannels() != 1:
+            self._wav.close()
+            raise ValueError(f"{self.path} is not mono")
+        self.sample_rate = self._wav.getframerate()
+        self.sample_width = self._wav.getsampwidth()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wav.close()
+
+    def frames(self) -> Iterator[bytes]:
+        samples = self.sample_rate * self.frame_ms // 1000
+        started = time.monotonic()
+        count = 0
+        while True:
+            frame = self._wav.readframes(samples)
+            if len(frame) < samples * self.sample_width:
+                return
+            if self.realtime:
+                time.sleep(max(0.0, started + count * self.frame_ms / 1000 - time.monotonic()))
+            count += 1
+            yield frame
+
+
+class ContinuousListener:
+    """Always-on voice input: one thread captures audio and cuts it into utterances with
+    EnergyVAD, another sends only those utterances to the recogniser.
+
+    recognise(audio, sample_rate, sample_width) returns text or None. While is_muted()
+    is true (e.g. the assistant is talking) audio is discarded. adapt(rms, in_speech),
+    if given, sees every frame's energy and returns the threshold to use next.
+    """
+
+    def __init__(self, open_source: Callable, threshold: Callable[[], float],
+                 recognise: Callable[[bytes, int, int], Optional[str]], on_text: Callable[[str], None],
+                 is_muted: Optional[Callable[[], bool]] = None,
+                 adapt: Optional[Callable[[float, bool], float]] = None):
+        self.open_source = open_source
+        self.threshold = threshold
+        self.recognise = recognise
+        self.on_text = on_text
+        self.is_muted = is_muted
+        self.adapt = adapt
+        self.vad: Optional[EnergyVAD] = None
+        self.frames = 0
+        self.utterances = 0
+        self.speech_seconds = 0.0
+        self._queue: "queue.Queue[Optional[Tuple[bytes, int, int]]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        self._threads = [threading.Thread(target=self._capture, name="voice-capture", daemon=True),
+                         threading.Thread(target=self._recognise_loop, name="voice-recognise", daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _capture(self):
+        try:
+            with self.open_source() as source:
+                self.vad = vad = EnergyVAD(self.threshold(), source.sample_width, source.frame_ms)
+                for frame in source.frames():
+                    if self._stop.is_set():
+                        break
+                    self.frames += 1
+                    if self.is_muted is not None and self.is_muted():
+                        vad.reset()
+                        continue
+                    utterance = vad.process(frame)
+                    if self.adapt is not None:
+                        vad.threshold = self.adapt(vad.last_rms, vad.in_speech)
+                    if utterance:
+                        self._submit(utterance, source)
+                utterance = vad.flush()
+                if utterance:
+                    self._submit(utterance, source)
+        except Exception as e:
+            print(f"Voice capture error: {e}")
+        finally:
+            self._queue.put(None)
+
+    def _submit(self, utterance: bytes, source):
+        self.utterances += 1
+        self.speech_seconds += len(utterance) / (source.sample_rate * source.sample_width)
+        self._queue.put((utterance, source.sample_rate, source.sample_width))
+
+    def _recognise_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                text = self.recognise(*item)
+                if text and not self._stop.is_set():
+                    self.on_text(text)
+            except Exception as e:
+                print(f"Voice recognition error: {e}")
@@ -1,35 +1,90 @@
-import requests
+import re
 from typing import Dict, Optional
-from config import APIConfig
+from config import APIConfig, CacheConfig
 from modules.json_db import db
+from modules.http_client import get_client, get_async_client
+from modules.cache import TTLCache
+from modules.singleflight import SingleFlight
+from modules.resilience import Upstream, upstream_timeout
 
 class WeatherModule:
     def __init__(self):
         self.api_key = APIConfig.OPENWEATHER_API_KEY
         self.base_url = APIConfig.OPENWEATHER_BASE_URL
+        self.cache = TTLCache(CacheConfig.WEATHER_TTL, CacheConfig.WEATHER_MAX_ENTRIES,
+                              CacheConfig.WEATHER_STALE_TTL)
+        self.flight = SingleFlight()  # concurrent misses for the same key share one request
+        self.upstream = Upstream("openweather")
 
-    def get_current_weather(self, location: str = None) -> Dict:
+    def _resolve_location(self, location: Optional[str]) -> str:
         if not location:
             prefs = db.get_user_preferences()
             loc = prefs.get('location', {})
             location = f"{loc.get('city', 'New York')},{loc.get('country', 'US')}"
-        params = {'q': location, 'appid': self.api_key, 'units': 'metric'}
-        try:
-            resp = requests.get(APIConfig.CURRENT_WEATHER_URL, params=params)
+        return location
+
+    @staticmethod
+    def _normalise_location(location: str) -> str:
+        location = re.sub(r"\s*,\s*", ",", location.strip().lower().rstrip("?.!"))
+        return re.sub(r"\s+", " ", location)
+
+    def _fetch(self, url: str, params: Dict) -> Dict:
+        return self.flight.do((url, params['q']), lambda: self._request(url, params))
+
+    def _request(self, url: str, params: Dict) -> Dict:
+        def attempt(timeout):
+            resp = get_client().get(url, params=params, timeout=timeout)
             resp.raise_for_status()
             return resp.json()
-        except:
+        try:
+            return self.upstream.call(attempt, upstream_timeout("weather"))
+        except Exception:
             return {}
 
-    def get_weather_forecast(self, location: str = None) -> Dict:
-        if not location:
-            prefs = db.get_user_preferences()
-            loc = prefs.get('location', {})
-            location = f"{loc.get('city', 'New York')},{loc.get('country', 'US')}"
-        params = {'q': location, 'appid': self.api_key, 'units': 'metric', 'cnt': 8}
-        try:
-            resp = requests.get(APIConfig.FORECAST_URL, params=params)
+    async def _fetch_async(self, url: str, params: Dict) -> Dict:
+        return await self.flight.do_async((url, params['q']), lambda: self._request_async(url, params))
+
+    async def _request_async(self, url: str, params: Dict) -> Dict:
+        async def attempt(timeout):
+            resp = await get_async_client().get(url, params=params, timeout=timeout)
             resp.raise_for_status()
             return resp.json()
-        except:
+        try:
+            return await self.upstream.call_async(attempt, upstream_timeout("weather"))
+        except Exception:
             return {}
+
+    def get_current_weather(self, location: str = None) -> Dict:
+        location = self._normalise_location(self._resolve_location(location))
+        params = {'q': location, 'appid': self.api_key, 'units': 'metric'}
+        key = ('current', location)
+        return (self.cache.get_or_fetch(key, lambda: self._fetch(APIConfig.CURRENT_WEATHER_URL, params))
+                or self.cache.peek(key) or {})
+
+    def get_weather_forecast(self, location: str = None) -> Dict:
+        location = self._normalise_location(self._resolve_location(location))
+        params = {'q': location, 'appid': self.api_key, 'units': 'metric', 'cnt': 8}
+        key = ('forecast', location)
+        return (self.cache.get_or_fetch(key, lambda: self._fetch(APIConfig.FORECAST_URL, params))
+                or self.cache.peek(key) or {})
+
+    async def get_current_weather_async(self, location: str = None) -> Dict:
+        location = self._normalise_location(self._resolve_location(location))
+        params = {'q': location, 'appid': self.api_key, 'units': 'metric'}
+        url = APIConfig.CURRENT_WEATHER_URL
+        key = ('current', location)
+        weather = await self.cache.get_or_fetch_async(key, lambda: self._fetch_async(url, params),
+                                                      lambda: self._fetch(url, params))
+        return weather or self.cache.peek(key) or {}
+
+    async def get_weather_forecast_async(self, location: str = None) -> Dict:
+        location = self._normalise_location(self._resolve_location(location))
+        params = {'q': location, 'appid': self.api_key, 'units': 'metric', 'cnt': 8}
+        url = APIConfig.FORECAST_URL
+        key = ('forecast', location)
+        weather = await self.cache.get_or_fetch_async(key, lambda: self._fetch_async(url, params),
+                                                      lambda: self._fetch(url, params))
+        return weather or self.cache.peek(key) or {}
+
+    def cache_stats(self) -> Dict:
+        return dict(self.cache.stats(), **self.flight.stats(), upstream=self.upstream.stats())
@@ -7,4 +7,4 @@ text = assistant.listen_to_voice()
 print(f"You said: {text}")
 
 print("\nTesting text-to-speech...")
-assistant.speak("This is a test of the voice system")
\ No newline at end of file
+assistant.speak("This is a test of the voice system").wait()
\ No newline at end of file
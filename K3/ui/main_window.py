@@ -2,25 +2,30 @@ import sys
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QSplitter, QStatusBar, QScrollArea, QFrame, QGroupBox, 
                             QLabel, QLineEdit)
-from PyQt5.QtCore import Qt, QSize, QTimer, QTime
+from PyQt5.QtCore import Qt, QSize, QTimer, QTime, pyqtSignal
 from PyQt5.QtGui import QFont, QPixmap
 from qt_material import apply_stylesheet
-from config import UIConfig, PathConfig
+from config import UIConfig, PathConfig, AssistantConfig
 from modules.assistant_core import FridayAssistant
 from ui.widgets import (ChatBubble, AnimatedButton, CommandInput,
                        WeatherWidget, NewsWidget)
+from ui.workers import TaskManager
 
 class MainWindow(QMainWindow):
+    warmed_up = pyqtSignal()  # every assistant subsystem has been built
+    voice_command = pyqtSignal(str)  # text heard by continuous listening, delivered on the GUI thread
+
     def __init__(self):
         super().__init__()
         self.assistant = FridayAssistant()
+        self.tasks = TaskManager(parent=self)
         self.setup_ui()
         self.setup_connections()
         self.apply_styles()
-        self.update_weather()
-        self.update_news()
-        # Connect reminder signal
-        self.assistant.reminder.reminder_triggered.connect(self.show_reminder_notification)
+        # Fetch the dashboard and build the rest of the assistant once the window has painted
+        QTimer.singleShot(0, self.update_weather)
+        QTimer.singleShot(0, self.update_news)
+        QTimer.singleShot(0, self.start_assistant)
         
         # Setup clock timer
         self.clock_timer = QTimer(self)
@@ -169,11 +174,25 @@ class MainWindow(QMainWindow):
         self.status_bar.setStyleSheet("background-color: #2a2a2a; color: white;")
         self.setStatusBar(self.status_bar)
 
+    def start_assistant(self):
+        """Build the assistant's subsystems in the background, reminders first"""
+        self.tasks.start("warm-up", self._warm_up, on_finished=self.on_warmed_up)
+
+    def _warm_up(self):
+        # Runs on a worker thread; the signal is still delivered to the GUI thread
+        self.assistant.reminder.reminder_triggered.connect(self.show_reminder_notification)
+        self.assistant.warm_up()
+
+    def on_warmed_up(self):
+        if AssistantConfig.CONTINUOUS_LISTENING and AssistantConfig.VOICE_ENABLED:
+            self.assistant.start_listening(self.voice_command.emit)
+            self.status_bar.showMessage("Listening continuously", 3000)
+        self.warmed_up.emit()
+
     def show_reminder_notification(self, name: str, message: str):
         """Show a reminder notification in the chat"""
         notification = f"⏰ REMINDER: {name}\n{message}"
         self.add_chat_message(notification, is_user=False)
-        self.assistant.speak(f"Reminder: {message}")
 
     def update_clock(self):
         """Update the clock display with current time"""
@@ -184,11 +203,26 @@ class MainWindow(QMainWindow):
     def setup_connections(self):
         self.command_input.returnPressed.connect(self.process_command)
         self.mic_button.clicked.connect(self.handle_voice_input)
+        self.tasks.busy_changed.connect(self.on_busy_changed)
+        self.voice_command.connect(self.on_voice_command)
+
+    def on_busy_changed(self, busy: bool):
+        if busy:
+            self.status_bar.showMessage("Working...")
+        else:
+            self.status_bar.clearMessage()
 
     def handle_voice_input(self):
         """Handle voice input with proper feedback"""
+        if self.assistant.listening:  # the microphone is already open
+            self.status_bar.showMessage("Listening continuously; just speak", 2000)
+            return
         self.status_bar.showMessage("Listening...", 2000)
-        text = self.assistant.listen_to_voice()
+        self.mic_button.setEnabled(False)
+        self.tasks.start("voice", self.assistant.listen_to_voice, on_result=self.on_voice_result,
+                         on_finished=lambda: self.mic_button.setEnabled(True))
+
+    def on_voice_result(self, text):
         if text and not any(err in text.lower() for err in ["error", "sorry", "hear"]):
             self.command_input.setText(text)
             self.process_command()
@@ -196,6 +230,11 @@ class MainWindow(QMainWindow):
             self.add_chat_message(text, is_user=False)
             self.status_bar.showMessage("Voice command processed", 2000)
 
+    def on_voice_command(self, text: str):
+        """Run text heard by continuous listening; unlike listen_to_voice it never carries an error message"""
+        self.command_input.setText(text)
+        self.process_command()
+
     def process_command(self):
         """Process and display commands"""
         command = self.command_input.text().strip()
@@ -209,20 +248,31 @@ class MainWindow(QMainWindow):
             self.speak_time_only()
             return
 
-        response = self.assistant.process_command(command)
-        self.add_chat_message(response, is_user=False)
+        # Fill the reply bubble as the response streams in from a worker thread
+        bubble = self.add_chat_message("", is_user=False)
+
+        def on_piece(piece):
+            bubble.append_text(piece)
+            self.scroll_chat_to_bottom()
+
+        def on_error(message):
+            bubble.append_text(f"Error processing command: {message}")
 
-        if "weather" in command.lower():
-            self.update_weather()
-        elif "news" in command.lower():
-            self.update_news()
+        def on_finished():
+            if "weather" in command.lower():
+                self.update_weather()
+            elif "news" in command.lower():
+                self.update_news()
+
+        self.tasks.start("command", self.assistant.stream_command, command, on_progress=on_piece,
+                         on_error=on_error, on_finished=on_finished)
 
     def speak_time_only(self):
         """Speak the current time without showing in chat"""
         current_time = QTime.currentTime()
         time_text = current_time.toString("h:mm AP")
-        # Speak the time
-        self.assistant.speak(f"The current time is {time_text}")
+        # Speak the time, dropping an earlier time announcement that hasn't been spoken yet
+        self.assistant.speak(f"The current time is {time_text}", key="time")
         # Brief feedback
         self.status_bar.showMessage(f"Time spoken: {time_text}", 3000)
 
@@ -230,19 +280,29 @@ class MainWindow(QMainWindow):
         """Add message bubble to chat area"""
         bubble = ChatBubble(text, is_user)
         self.chat_layout.addWidget(bubble)
-        # Scroll to bottom
+        self.scroll_chat_to_bottom()
+        bubble.show()
+        return bubble
+
+    def scroll_chat_to_bottom(self):
         self.chat_scroll.verticalScrollBar().setValue(
             self.chat_scroll.verticalScrollBar().maximum()
         )
-        bubble.show()
 
     def update_weather(self):
-        data = self.assistant.weather.get_current_weather()
-        self.weather_widget.update_weather(data)
+        # The module is built inside the worker, so a cold start never blocks the GUI thread
+        self.tasks.start("weather", lambda: self.assistant.weather.get_current_weather(),
+                         on_result=self.weather_widget.update_weather, replace=True)
 
     def update_news(self):
-        news = self.assistant.news.get_news()
-        self.news_widget.update_news(news)
+        self.tasks.start("news", lambda: self.assistant.news.get_news(),
+                         on_result=self.news_widget.update_news, replace=True)
+
+    def closeEvent(self, event):
+        self.tasks.cancel_all()
+        self.assistant.stop_listening()
+        self.assistant.stop_speaking()
+        super().closeEvent(event)
 
     def apply_styles(self):
         """Apply modern UI styling"""
@@ -271,10 +331,6 @@ class MainWindow(QMainWindow):
             }
         """)
 
-# Don't forget to import your reminder signal connection somewhere in your setup
-# e.g., if your ReminderModule has a signal called 'reminder_triggered':
-# self.assistant.reminder.reminder_triggered.connect(self.show_reminder_notification)
-
 if __name__ == "__main__":
     from PyQt5.QtWidgets import QApplication
     app = QApplication(sys.argv)
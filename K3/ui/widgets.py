@@ -18,6 +18,10 @@ class ChatBubble(QLabel):
             self.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         self.setText(text)
 
+    def append_text(self, text):
+        """Extend the bubble while a response is still streaming in"""
+        self.setText(self.text() + text)
+
 class AnimatedButton(QPushButton):
     def __init__(self, icon_path, text='', parent=None):
         super().__init__(text, parent)
@@ -0,0 +1,112 @@
+import threading
+from typing import Callable, Dict, Optional
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from config import UIConfig
+
+class WorkerSignals(QObject):
+    result = pyqtSignal(object)
+    progress = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+class Worker(QRunnable):
+    """Runs fn(*args) on the thread pool. If fn returns a generator, each item is
+    emitted through `progress` and cancellation is checked between items."""
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            if self.is_cancelled:
+                return
+            result = self.fn(*self.args, **self.kwargs)
+            if hasattr(result, '__next__'):
+                for item in result:
+                    if self.is_cancelled:
+                        result.close()
+                        break
+                    self.signals.progress.emit(item)
+                result = None
+            if not self.is_cancelled:
+                self.signals.result.emit(result)
+        except Exception as e:
+            if not self.is_cancelled:
+                self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+class TaskManager(QObject):
+    """Starts workers on a QThreadPool and tracks them so the UI can show a busy state;
+    the animation state stays with the assistant"""
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, pool: Optional[QThreadPool] = None, parent=None):
+        super().__init__(parent)
+        if pool is None:
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(UIConfig.WORKER_THREADS)
+        self.pool = pool
+        self._tasks: Dict[str, Worker] = {}
+        self._counter = 0
+
+    def start(self, name: str, fn: Callable, *args, on_result: Callable = None,
+              on_progress: Callable = None, on_error: Callable = None,
+              on_finished: Callable = None, replace: bool = False) -> Worker:
+        """Run fn in the background; with replace=True a running task of the same name is cancelled"""
+        if name in self._tasks:
+            if replace:
+                self._tasks[name].cancel()
+            else:
+                self._counter += 1
+                name = f"{name}#{self._counter}"
+        worker = Worker(fn, *args)
+        if on_result:
+            worker.signals.result.connect(on_result)
+        if on_progress:
+            worker.signals.progress.connect(on_progress)
+        if on_error:
+            worker.signals.error.connect(on_error)
+        else:
+            worker.signals.error.connect(lambda message: print(f"Task '{name}' failed: {message}"))
+        if on_finished:
+            worker.signals.finished.connect(on_finished)
+        worker.signals.finished.connect(lambda: self._task_finished(name, worker))
+
+        was_busy = self.is_busy
+        self._tasks[name] = worker
+        if not was_busy:
+            self.busy_changed.emit(True)
+        self.pool.start(worker)
+        return worker
+
+    def _task_finished(self, name: str, worker: Worker):
+        if self._tasks.get(name) is worker:
+            del self._tasks[name]
+        if not self.is_busy:
+            self.busy_changed.emit(False)
+
+    def cancel(self, name: str):
+        worker = self._tasks.get(name)
+        if worker:
+            worker.cancel()
+
+    def cancel_all(self):
+        for worker in self._tasks.values():
+            worker.cancel()
+
+    @property
+    def is_busy(self) -> bool:
+        return bool(self._tasks)